@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""One entry point for the Claptrap Python tools: `claptrap <command> [args...]`, also shipped as dist/claptrap.pyz."""
+
+# Each command's script is imported only once the command is known, so a run loads that script's modules and nothing
+# else; this module imports only sys and os itself.
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # the checkout, or the .pyz when zipped
+
+# command -> (directory under ROOT, module). Everything after the command is passed to the module's main(argv).
+COMMANDS = {
+    "nb summary": ("skills/jupyter-notebooks/scripts", "nb_summary"),
+    "nb read": ("skills/jupyter-notebooks/scripts", "nb_read"),
+    "nb search": ("skills/jupyter-notebooks/scripts", "nb_search"),
+    "nb edit": ("skills/jupyter-notebooks/scripts", "nb_edit"),
+    "nb index": ("skills/jupyter-notebooks/scripts", "nb_index"),
+    "nb watch": ("skills/jupyter-notebooks/scripts", "nb_watch"),
+    "state": ("skills/_archive/ct-manage-state-file/scripts", "state_io"),
+    "gh spec": ("skills/dd-grill-me/scripts", "gh_spec_create"),
+    "gh plan": ("skills/dd-writing-plans/scripts", "gh_plan_create"),
+    "gh body": ("skills/dd-writing-plans/scripts", "gh_issue_body"),
+    "install": ("bootstrap", "install"),
+}
+
+# Third-party imports a command needs, with how to get them; the zipapp bundles only the standard library.
+REQUIREMENTS = {"state": ("bs4", "beautifulsoup4")}
+
+
+def usage() -> str:
+    lines = ["usage: claptrap <command> [args...]", "", "commands:"]
+    for command, (directory, module) in COMMANDS.items():
+        lines.append(f"  {command:<12} {directory}/{module}.py")
+    lines += ["", "Run `claptrap <command> --help` for a command's options."]
+    return "\n".join(lines)
+
+
+def resolve(argv: list[str]) -> tuple[str, list[str]] | None:
+    for words in (2, 1):
+        command = " ".join(argv[:words])
+        if len(argv) >= words and command in COMMANDS:
+            return command, argv[words:]
+    return None
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print(usage())
+        return
+    resolved = resolve(argv)
+    if resolved is None:
+        print(f"claptrap: unknown command {' '.join(argv[:2])!r}\n\n{usage()}", file=sys.stderr)
+        raise SystemExit(2)
+    command, rest = resolved
+    directory, module = COMMANDS[command]
+    if command == "install" and not os.path.isdir(ROOT):
+        print("claptrap: install links files from a checkout; run bootstrap/install.py from the repository", file=sys.stderr)
+        raise SystemExit(2)
+
+    path = os.path.join(ROOT, directory)
+    sys.path.insert(0, path)
+    # argv[0] names the script itself, so usage lines and trace records read the same as a direct run.
+    sys.argv = [os.path.join(path, f"{module}.py"), *rest]
+    try:
+        target = __import__(module)
+    except ImportError as error:
+        needed = REQUIREMENTS.get(command)
+        if needed is None or error.name != needed[0]:
+            raise
+        hint = f"pip install {needed[1]}, or uv run {directory}/{module}.py"
+        print(f"claptrap {command}: needs {needed[1]} ({hint})", file=sys.stderr)
+        raise SystemExit(1)
+    target.main(rest)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Opt-in timing spans for the Claptrap Python tools, appended to a JSONL sink; `report` prints p50/p95 per span."""
+# Vendored beside every script that uses it (bootstrap/ and the skill script directories); keep the copies identical.
+
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import math
+import os
+import sys
+import time
+
+TYPE_CHECKING = False  # typing.TYPE_CHECKING without importing typing
+if TYPE_CHECKING:
+    import subprocess
+
+SINK_ENV = "CLAPTRAP_TRACE"  # unset or "0": off; "1": DEFAULT_SINK; anything else: the sink path
+DEFAULT_SINK = os.path.expanduser("~/.local/state/claptrap/trace.jsonl")
+
+
+def sink_path() -> str | None:
+    value = os.environ.get(SINK_ENV, "")
+    if value.lower() in ("", "0", "off"):
+        return None
+    return DEFAULT_SINK if value.lower() in ("1", "on") else os.path.expanduser(value)
+
+
+SINK = sink_path()
+ENABLED = SINK is not None
+SCRIPT = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "python"
+RUN = f"{os.getpid()}-{time.time_ns() // 1_000_000}"
+STARTED = time.perf_counter()
+FLUSH_EVERY = 1000  # buffered records that trigger a write, so a long-running process never holds more
+records: list[str] = []
+
+if ENABLED:
+    import threading  # only a traced run has anything to flush
+
+    flush_lock = threading.Lock()
+
+
+class NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> NoopSpan:
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+class Span:
+    __slots__ = ("name", "attrs", "start")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name, self.attrs = name, attrs
+
+    def __enter__(self) -> Span:
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        record(self.name, (time.perf_counter() - self.start) * 1000, self.attrs, exc_type)
+        return False
+
+    # Attributes known only inside the span, e.g. an HTTP status.
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+NOOP = NoopSpan()
+
+
+def record(name: str, ms: float, attrs: dict, exc_type: type | None = None) -> None:
+    entry = {"ts": round(time.time(), 3), "run": RUN, "script": SCRIPT, "span": name, "ms": round(ms, 3), **attrs}
+    if exc_type is not None and not issubclass(exc_type, SystemExit):
+        entry["error"] = exc_type.__name__
+    records.append(json.dumps(entry, separators=(",", ":"), default=str))  # list.append is atomic across threads
+    if len(records) >= FLUSH_EVERY:
+        flush()
+
+
+# When off, every span is the one shared no-op, so instrumented code pays a flag check and nothing else.
+def span(name: str, **attrs) -> Span | NoopSpan:
+    return Span(name, attrs) if ENABLED else NOOP
+
+
+def traced(name: str):
+    def decorate(function):
+        if not ENABLED:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with Span(name, {}):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+# subprocess.run, recorded as a "subprocess" span tagged with the program name.
+def run(cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
+    import subprocess  # only scripts that spawn pay for the import
+
+    if not ENABLED:
+        return subprocess.run(cmd, **kwargs)
+    with Span("subprocess", {"argv0": os.path.basename(str(cmd[0]))}) as current:
+        result = subprocess.run(cmd, **kwargs)
+        current.set(returncode=result.returncode)
+        return result
+
+
+# Spans are buffered and written at exit, every FLUSH_EVERY records, or when a long-running caller flushes after a
+# unit of work, so tracing adds no write per span to what it measures.
+def flush() -> None:
+    if not records:
+        return
+    with flush_lock:
+        count = len(records)  # records appended while writing stay for the next flush
+        if not count:
+            return
+        try:
+            os.makedirs(os.path.dirname(SINK) or ".", exist_ok=True)
+            # One O_APPEND write per flush keeps concurrent runs' lines from interleaving.
+            with open(SINK, "a", encoding="utf-8") as handle:
+                handle.write("".join(f"{line}\n" for line in records[:count]))
+        except OSError as error:
+            print(f"claptrap_trace: cannot write {SINK}: {error}", file=sys.stderr)
+        del records[:count]
+
+
+def flush_at_exit() -> None:
+    record("total", (time.perf_counter() - STARTED) * 1000, {})
+    flush()
+
+
+if ENABLED and __name__ != "__main__":  # the report command itself is not traced
+    atexit.register(flush_at_exit)
+
+
+###################################################################################################
+# Report
+###################################################################################################
+# Nearest-rank percentile.
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def report(path: str, by_script: bool, script: str | None) -> list[dict]:
+    durations: dict[tuple[str, str], list[float]] = {}
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if script and entry.get("script") != script:
+                continue
+            key = (entry.get("script", "?") if by_script else "", entry.get("span", "?"))
+            durations.setdefault(key, []).append(float(entry.get("ms", 0)))
+    rows = []
+    for (script_name, name), values in durations.items():
+        values.sort()
+        rows.append({
+            "script": script_name,
+            "span": name,
+            "count": len(values),
+            "p50_ms": round(percentile(values, 0.50), 3),
+            "p95_ms": round(percentile(values, 0.95), 3),
+            "total_ms": round(sum(values), 3),
+        })
+    return sorted(rows, key=lambda row: -row["total_ms"])
+
+
+def main(argv: list[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+    report_parser = sub.add_parser("report", help="aggregate recorded spans")
+    report_parser.add_argument("sink", nargs="?", help=f"trace file (default ${SINK_ENV} or {DEFAULT_SINK})")
+    report_parser.add_argument("--by-script", action="store_true", help="one row per script and span")
+    report_parser.add_argument("--script", help="only spans recorded by this script name")
+    report_parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    path = args.sink or SINK or DEFAULT_SINK
+    if not os.path.exists(path):
+        print(f"No trace file at {path}; run a script with {SINK_ENV}=1 first.", file=sys.stderr)
+        raise SystemExit(1)
+    rows = report(path, args.by_script, args.script)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    label = "script / span" if args.by_script else "span"
+    print(f"{label:<40} {'count':>7} {'p50_ms':>10} {'p95_ms':>10} {'total_ms':>12}")
+    for row in rows:
+        name = f"{row['script']} / {row['span']}" if args.by_script else row["span"]
+        print(f"{name:<40} {row['count']:>7} {row['p50_ms']:>10.3f} {row['p95_ms']:>10.3f} {row['total_ms']:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 from pathlib import Path
+import argparse
 import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import claptrap_trace
 
 ###################################################################################################
 # Config
@@ -11,6 +16,9 @@ OPENCODE_ROOT = HOME / ".config/opencode"
 
 PLUGIN_ROOT = PROJECT_ROOT / "opencode/claptrap-plugin"
 
+# Links written by the last install; a re-run diffs against it instead of sweeping every provider directory.
+MANIFEST_PATH = HOME / ".local/state/claptrap/install-manifest.json"
+
 INSTRUCTIONS_LINK = OPENCODE_ROOT / "claptrap/instructions.md"
 INSTRUCTIONS_ENTRY = "~/.config/opencode/claptrap/instructions.md"
 
@@ -23,6 +31,14 @@ LINKS = {
     OPENCODE_ROOT / "commands/claptrap": PLUGIN_ROOT / "commands",
 }
 
+# Repository Skills to deploy, and which providers get them; each Skill becomes <provider root>/<name> -> skills/<name>.
+SKILLS_MANIFEST = PROJECT_ROOT / "bootstrap/skills.json"
+SKILL_ROOTS = {
+    "claude": HOME / ".claude/skills",
+    "cursor": HOME / ".cursor/skills",
+    "opencode": OPENCODE_ROOT / "skills",
+}
+
 SWEEP_ROOTS = [
     OPENCODE_ROOT / "agents",
     OPENCODE_ROOT / "skills",
@@ -74,39 +90,138 @@ def remove_repo_link(path: Path) -> bool:
     return True
 
 
-def prepare_claptrap_directory() -> None:
+def prepare_claptrap_directory(check: bool = False) -> bool:
     path = OPENCODE_ROOT / "claptrap"
     if path.is_symlink():
         known_conflict = (OPENCODE_ROOT / "commands").resolve(strict=False)
         if not resolves_into_repo(path) and path.resolve(strict=False) != known_conflict:
             fail(f"Refusing to replace non-repo claptrap symlink: {path}")
+        if check:
+            info(f"Would remove conflicting claptrap symlink: {path}")
+            return True
         path.unlink()
         info(f"Removed conflicting claptrap symlink: {path}")
     elif path.exists() and not path.is_dir():
         fail(f"Cannot create {path}: a non-directory already exists")
+    elif not path.exists() and check:
+        info(f"Would create {path}")
+        return True
     path.mkdir(parents=True, exist_ok=True)
+    return False
 
 
-def sweep_repo_links() -> None:
+def sweep_repo_links(keep: set[Path]) -> None:
+    # Only needed when no manifest says what an earlier install created (first run, or installs that predate it).
     for root in SWEEP_ROOTS:
         if not root.exists() or not root.is_dir():
             continue
         for entry in list(root.iterdir()):
-            remove_repo_link(entry)
+            if entry not in keep:
+                remove_repo_link(entry)
 
 
 def link(source: Path, target: Path) -> None:
-    source = source.resolve()
-    if not source.exists(): fail(f"Missing repo source: {source}")
     target.parent.mkdir(parents=True, exist_ok=True)
-    if target.is_symlink():
-        if not resolves_into_repo(target):
-            fail(f"Refusing to replace non-repo symlink: {target}")
-        target.unlink()
-    elif target.exists():
-        fail(f"Refusing to replace non-repo file or directory: {target}")
-    target.symlink_to(source, target_is_directory=source.is_dir())
-    success(f"Linked {target} -> {source}")
+    # Build the new link beside the old one and rename it over, so the target never disappears mid-install.
+    temp = target.with_name(f".{target.name}.claptrap-tmp")
+    if temp.is_symlink(): temp.unlink()
+    temp.symlink_to(source, target_is_directory=source.is_dir())
+    os.replace(temp, target)
+
+
+###################################################################################################
+# Manifest
+###################################################################################################
+def read_manifest() -> dict[Path, Path] | None:
+    try:
+        data = json.loads(MANIFEST_PATH.read_text())
+        return {Path(target): Path(source) for target, source in data["links"].items()}
+    except (OSError, json.JSONDecodeError, KeyError, AttributeError, TypeError):
+        return None
+
+
+def write_manifest(links: dict[Path, Path]) -> None:
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    temp = MANIFEST_PATH.with_name(f".{MANIFEST_PATH.name}.tmp")
+    temp.write_text(json.dumps({"links": {str(target): str(source) for target, source in links.items()}}, indent=2) + "\n")
+    os.replace(temp, MANIFEST_PATH)
+
+
+def current_link(target: Path) -> Path | None:
+    if not target.is_symlink():
+        return None
+    return Path(os.readlink(target))
+
+
+def owned_elsewhere(target: Path, source: Path) -> str | None:
+    if target.is_symlink() and not resolves_into_repo(target) and current_link(target) != source:
+        return "non-repo symlink"
+    if not target.is_symlink() and target.exists():
+        return "non-repo file or directory"
+    return None
+
+
+# Desired links whose target is missing or points somewhere else, and the Skill targets something else already owns.
+def plan_links(desired: dict[Path, Path]) -> tuple[dict[Path, Path], dict[Path, str]]:
+    changes, skipped = {}, {}
+    for target, source in desired.items():
+        if not source.exists(): fail(f"Missing repo source: {source}")
+        owner = owned_elsewhere(target, source)
+        if owner and target.parent in SKILL_ROOTS.values():
+            # e.g. the same Skill installed by `npx skills add`; leave it to whoever put it there.
+            skipped[target] = owner
+        elif owner:
+            fail(f"Refusing to replace {owner}: {target}")
+        elif current_link(target) != source:
+            changes[target] = source
+    return changes, skipped
+
+
+def skill_links(manifest: Path) -> dict[Path, Path]:
+    try:
+        data = json.loads(manifest.read_text())
+    except (OSError, json.JSONDecodeError) as error:
+        fail(f"Cannot read skills manifest {manifest}: {error}")
+    unknown = [name for name in data.get("providers", []) if name not in SKILL_ROOTS]
+    if unknown:
+        fail(f"Unknown providers in {manifest}: {', '.join(unknown)} (known: {', '.join(SKILL_ROOTS)})")
+    links = {}
+    for name in data.get("skills", []):
+        source = PROJECT_ROOT / "skills" / name
+        if not (source / "SKILL.md").is_file():
+            fail(f"Not a repository Skill: {source}")
+        for provider in data.get("providers", []):
+            links[SKILL_ROOTS[provider] / name] = source.resolve()
+    return links
+
+
+# Split links into one group per provider Skill root, plus one for the plugin links.
+def by_root(links: dict[Path, Path]) -> list[dict[Path, Path]]:
+    groups: dict[Path | None, dict[Path, Path]] = {}
+    for target, source in links.items():
+        root = target.parent if target.parent in SKILL_ROOTS.values() else None
+        groups.setdefault(root, {})[target] = source
+    return list(groups.values())
+
+
+def in_parallel(action, groups: list[dict[Path, Path]]) -> list:
+    # Provider roots are independent directories, often on different mounts; check and link them concurrently.
+    # Exceptions (including fail()'s SystemExit) re-raise here when the results are collected.
+    if not groups:
+        return []
+    with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+        return list(pool.map(action, groups))
+
+
+def link_all(links: dict[Path, Path]) -> dict[Path, Path]:
+    for target, source in links.items():
+        link(source, target)
+    return links
+
+
+# Links the last install created that are no longer wanted and still point into the repo.
+def stale_links(previous: dict[Path, Path], desired: dict[Path, Path]) -> list[Path]:
+    return [target for target in previous if target not in desired and target.is_symlink() and resolves_into_repo(target)]
 
 
 ###################################################################################################
@@ -150,12 +265,64 @@ def print_config_warnings() -> None:
 ###################################################################################################
 # Main
 ###################################################################################################
-def main() -> None:
-    header("Installing Claptrap OpenCode continuous learning")
-    prepare_claptrap_directory()
-    sweep_repo_links()
-    for target, source in LINKS.items():
-        link(source, target)
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Install Claptrap's OpenCode links and repository Skills.")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="report what would change without touching anything; exit 1 if anything would",
+    )
+    parser.add_argument(
+        "--skills",
+        type=Path,
+        default=SKILLS_MANIFEST,
+        help="JSON manifest of {providers, skills} to deploy",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    header(f"{'Checking' if args.check else 'Installing'} Claptrap OpenCode continuous learning")
+    desired = {target: source.resolve() for target, source in LINKS.items()} | skill_links(args.skills)
+    pending = prepare_claptrap_directory(check=args.check)
+    changes, skipped = {}, {}
+    with claptrap_trace.span("plan", links=len(desired)):
+        for group, owned in in_parallel(plan_links, by_root(desired)):
+            changes.update(group)
+            skipped.update(owned)
+    for target, owner in skipped.items():
+        warning(f"Skipping {target}: a {owner} is already there")
+    desired = {target: source for target, source in desired.items() if target not in skipped}
+    previous = read_manifest()
+    stale = stale_links(previous, desired) if previous is not None else []
+
+    if args.check:
+        for target, source in changes.items():
+            info(f"Would link {target} -> {source}")
+        for target in stale:
+            info(f"Would remove stale repo-owned symlink: {target}")
+        if previous is None:
+            info(f"No install manifest at {MANIFEST_PATH}; a full install would also sweep provider directories")
+        if pending or changes or stale or previous is None:
+            raise SystemExit(1)
+        success("Up to date.")
+        return
+
+    if previous is None:
+        with claptrap_trace.span("sweep"):
+            sweep_repo_links(keep=set(desired) - set(changes))
+    for target in stale:
+        remove_repo_link(target)
+    with claptrap_trace.span("link", links=len(changes)):
+        linked = in_parallel(link_all, by_root(changes))
+    for group in linked:
+        for target, source in group.items():
+            success(f"Linked {target} -> {source}")
+    if not changes:
+        success("Links already up to date")
+    with claptrap_trace.span("manifest.write"):
+        write_manifest(desired)
     print_config_warnings()
     success("Done.")
 
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Stream Claptrap plugin events from the segmented log, opening only the day segments a time window touches."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+DAY_S = 24 * 60 * 60
+SEGMENT_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+PINNED = "pinned.jsonl"
+DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)([smhdw])")
+DURATION_S = {"s": 1, "m": 60, "h": 3600, "d": DAY_S, "w": 7 * DAY_S}
+
+
+def default_state_dir() -> Path:
+    return Path.home() / ".local/state/claptrap"  # plugin.ts STATE_DIR
+
+
+# Event time in epoch seconds; 0 for a missing or malformed ts, as the plugin's eventTime does.
+def event_time(event: dict) -> float:
+    value = event.get("ts")
+    if isinstance(value, (int, float)):
+        return value / 1000
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def segment_day(name: str) -> date:
+    return date.fromisoformat(name)
+
+
+# Day segments named by index.json, falling back to a directory listing when there is no usable index.
+def indexed_segments(events_dir: Path) -> list[str]:
+    try:
+        names = json.loads((events_dir / "index.json").read_text(encoding="utf-8"))["segments"]
+        if isinstance(names, list) and all(isinstance(name, str) for name in names):
+            return sorted(name for name in names if SEGMENT_RE.fullmatch(name))
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    try:
+        names = [entry.name.removesuffix(".jsonl") for entry in os.scandir(events_dir) if entry.name.endswith(".jsonl")]
+    except OSError:
+        return []
+    return sorted(name for name in names if SEGMENT_RE.fullmatch(name))
+
+
+# Day segments overlapping [since, until], oldest first. A bounded window names its own days; only an open-ended
+# start needs the index to learn which days exist.
+def segment_paths(events_dir: Path, since: float | None, until: float | None) -> list[Path]:
+    last = datetime.fromtimestamp(until if until is not None else time.time(), timezone.utc).date()
+    if since is None:
+        names = [name for name in indexed_segments(events_dir) if segment_day(name) <= last]
+        # A background run's wrapper started by an older plugin can open a new day without re-indexing.
+        newest = segment_day(names[-1]) + timedelta(days=1) if names else last
+        days = [segment_day(name) for name in names]
+        days += [newest + timedelta(days=n) for n in range((last - newest).days + 1)]
+    else:
+        first = datetime.fromtimestamp(since, timezone.utc).date()
+        days = [first + timedelta(days=n) for n in range((last - first).days + 1)]
+    return [path for path in (events_dir / f"{day.isoformat()}.jsonl" for day in days) if path.exists()]
+
+
+def read_lines(path: Path) -> Iterator[dict]:
+    try:
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    value = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a concurrent append
+                if isinstance(value, dict):
+                    yield value
+    except FileNotFoundError:
+        return  # retention removed the segment between listing and opening it
+
+
+def iter_events(
+    since: float | None = None,
+    until: float | None = None,
+    state_dir: Path | None = None,
+    include_pinned: bool = True,
+) -> Iterator[dict]:
+    # Pinned `project_seen` events come first and ignore the window, as the plugin reads them; a legacy events.jsonl
+    # the plugin has not migrated yet is read too.
+    state_dir = state_dir or default_state_dir()
+    events_dir = state_dir / "events"
+    if include_pinned:
+        yield from read_lines(events_dir / PINNED)
+    paths = segment_paths(events_dir, since, until)
+    legacy = state_dir / "events.jsonl"
+    if legacy.exists():
+        paths.insert(0, legacy)
+    for path in paths:
+        for event in read_lines(path):
+            if event.get("event") == "project_seen" and path == legacy:
+                if include_pinned:
+                    yield event
+                continue
+            ts = event_time(event)
+            if (since is None or ts >= since) and (until is None or ts <= until):
+                yield event
+
+
+def parse_time(value: str, now: float) -> float:
+    match = DURATION_RE.fullmatch(value)
+    if match:
+        return now - float(match.group(1)) * DURATION_S[match.group(2)]
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a duration like 7d or an ISO date/time, got {value!r}")
+    return (moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)).timestamp()
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--since", help="duration back from now (30m, 12h, 7d, 2w) or ISO date/time (UTC unless given)")
+    parser.add_argument("--until", help="same forms as --since; default now")
+    parser.add_argument("--event", action="append", help="only this event type (repeatable)")
+    parser.add_argument("--state-dir", type=Path, help="Claptrap state directory (default ~/.local/state/claptrap)")
+    parser.add_argument("--no-pinned", action="store_true", help="leave out the pinned project_seen events")
+    parser.add_argument("--count", action="store_true", help="print counts by event type instead of events")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    now = time.time()
+    try:
+        since = parse_time(args.since, now) if args.since else None
+        until = parse_time(args.until, now) if args.until else None
+    except argparse.ArgumentTypeError as error:
+        print(error, file=sys.stderr)
+        raise SystemExit(2)
+    events = iter_events(since, until, args.state_dir, include_pinned=not args.no_pinned)
+    if args.event:
+        events = (event for event in events if event.get("event") in args.event)
+    if args.count:
+        for name, count in Counter(str(event.get("event")) for event in events).most_common():
+            print(f"{count}\t{name}")
+        return
+    for event in events:
+        sys.stdout.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Windowed /ct-status counts from per-day rollups, for one or many Claptrap state directories."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import claptrap_events
+
+# Each day segment gets a rollup: its event counts plus the byte offset already counted, so a refresh reads only what
+# was appended since and a closed day is never read again. Counts match buildStatusReport in logic.ts.
+ROLLUP_VERSION = 1
+DAY_S = claptrap_events.DAY_S
+WINDOWS_D = (7, 30)
+HARVESTER_AGENT = "ct-skill-harvester"
+TOP_SKILLS = 3
+
+# buildStatusReport's lines, in its order: report key -> rollup counter.
+METRICS = {
+    "skill_loads": "skill_loaded",
+    "mnemosyne_recalls": "memory_recalled",
+    "mnemosyne_stores": "memory_stored",
+    "managed_skill_changes": "managed_skill_changed",
+    "recall_gate_warnings": "gate_recall_warned",
+    "store_gate_warnings": "gate_store_warned",
+    "harvester_runs": "harvester_started",
+    "harvester_skill_changes": "harvester_skill_changed",
+}
+
+
+def tally(counts: Counter, event: dict) -> None:
+    name = str(event.get("event"))
+    counts[name] += 1
+    if name == "skill_loaded" and isinstance(event.get("name"), str):
+        counts[f"skill:{event['name']}"] += 1
+    if name == "managed_skill_changed" and event.get("agent") == HARVESTER_AGENT:
+        counts["harvester_skill_changed"] += 1
+
+
+def rollup_dir_for(state_dir: Path, rollup_root: Path | None) -> Path:
+    if rollup_root is None:
+        return state_dir / "rollups"
+    # One subdirectory per state dir, named after its path, so many machines' dirs can share a root.
+    return rollup_root / str(state_dir.resolve()).strip("/").replace("/", "__")
+
+
+def load_rollup(path: Path) -> dict | None:
+    try:
+        rollup = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return rollup if isinstance(rollup, dict) and rollup.get("version") == ROLLUP_VERSION else None
+
+
+def save_rollup(path: Path, rollup: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False) as temp:
+        json.dump(rollup, temp, separators=(",", ":"))
+    os.replace(temp.name, path)
+
+
+# Counts for one day segment, reading only what was appended since the stored checkpoint.
+def refresh_rollup(segment: Path, rollup_path: Path) -> Counter:
+    try:
+        stat = segment.stat()
+    except FileNotFoundError:
+        return Counter()
+    rollup = load_rollup(rollup_path)
+    # A different inode or a shorter file means the segment was replaced; start over rather than trust the offset.
+    if rollup is None or rollup.get("inode") != stat.st_ino or rollup.get("offset", 0) > stat.st_size:
+        rollup = {"version": ROLLUP_VERSION, "inode": stat.st_ino, "offset": 0, "counts": {}}
+    counts = Counter(rollup["counts"])
+    if rollup["offset"] == stat.st_size:
+        return counts
+    with segment.open("rb") as handle:
+        handle.seek(rollup["offset"])
+        chunk = handle.read(stat.st_size - rollup["offset"])
+    # Stop at the last newline: a line still being appended is counted on the next refresh, not twice.
+    complete = chunk[: chunk.rfind(b"\n") + 1]
+    for line in complete.splitlines():
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(event, dict):
+            tally(counts, event)
+    rollup.update(offset=rollup["offset"] + len(complete), counts=dict(counts))
+    save_rollup(rollup_path, rollup)
+    return counts
+
+
+def scan(paths: list[Path], since: float, until: float) -> Counter:
+    counts: Counter = Counter()
+    for path in paths:
+        for event in claptrap_events.read_lines(path):
+            if event.get("event") != "project_seen" and since <= claptrap_events.event_time(event) <= until:
+                tally(counts, event)
+    return counts
+
+
+# Counts for events with now - days <= ts <= now: whole days from rollups, the partial first day by scan.
+def window_counts(state_dir: Path, rollup_dir: Path, days: int, now: float) -> Counter:
+    events_dir = state_dir / "events"
+    since = now - days * DAY_S
+    first = datetime.fromtimestamp(since, timezone.utc).date()
+    last = datetime.fromtimestamp(now, timezone.utc).date()
+    counts = scan([events_dir / f"{first.isoformat()}.jsonl"], since, now)
+    for offset in range(1, (last - first).days + 1):
+        name = (first + timedelta(days=offset)).isoformat()
+        counts += refresh_rollup(events_dir / f"{name}.jsonl", rollup_dir / f"{name}.json")
+    # Not migrated to segments yet (the plugin does that at its next startup): no checkpoint to keep, so scan it.
+    legacy = state_dir / "events.jsonl"
+    if legacy.exists():
+        counts += scan([legacy], since, now)
+    return counts
+
+
+def prune_rollups(rollup_dir: Path, now: float) -> None:
+    oldest = datetime.fromtimestamp(now - max(WINDOWS_D) * DAY_S, timezone.utc).date().isoformat()
+    for path in rollup_dir.glob("*.json"):
+        if path.stem < oldest:
+            path.unlink(missing_ok=True)
+
+
+def report(counts_by_window: dict[int, Counter]) -> dict:
+    result = {}
+    for days, counts in counts_by_window.items():
+        result[f"last_{days}d"] = {key: counts[counter] for key, counter in METRICS.items()}
+    loads = counts_by_window[max(counts_by_window)]
+    skills = [(key[6:], n) for key, n in loads.items() if key.startswith("skill:")]
+    skills.sort(key=lambda item: (-item[1], item[0]))
+    result["most_loaded_skills"] = [{"name": name, "loads": n} for name, n in skills[:TOP_SKILLS]]
+    return result
+
+
+def state_dir_stats(state_dir: Path, rollup_root: Path | None, now: float) -> tuple[dict, dict[int, Counter]]:
+    rollup_dir = rollup_dir_for(state_dir, rollup_root)
+    counts = {days: window_counts(state_dir, rollup_dir, days, now) for days in WINDOWS_D}
+    prune_rollups(rollup_dir, now)
+    return report(counts), counts
+
+
+def print_text(name: str, stats: dict) -> None:
+    print(f"# {name}")
+    for days in WINDOWS_D:
+        print(f"Last {days} days")
+        for key, value in stats[f"last_{days}d"].items():
+            print(f"- {key.replace('_', ' ')}: {value}")
+    print("Most-loaded Skills")
+    for index, skill in enumerate(stats["most_loaded_skills"], 1):
+        print(f"{index}. {skill['name']} — {skill['loads']} loads")
+    if not stats["most_loaded_skills"]:
+        print("- none")
+    print()
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "state_dirs",
+        nargs="*",
+        type=Path,
+        help="Claptrap state directories (default ~/.local/state/claptrap)",
+    )
+    parser.add_argument("--rollup-root", type=Path, help="store rollups here instead of <state dir>/rollups")
+    parser.add_argument("--json", action="store_true", help="print JSON: per state dir and, for several, a fleet total")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    state_dirs = args.state_dirs or [claptrap_events.default_state_dir()]
+    now = time.time()
+    per_dir, fleet = {}, {days: Counter() for days in WINDOWS_D}
+    for state_dir in state_dirs:
+        if not (state_dir / "events").is_dir() and not (state_dir / "events.jsonl").exists():
+            print(f"skipping {state_dir}: no Claptrap event log", file=sys.stderr)
+            continue
+        stats, counts = state_dir_stats(state_dir, args.rollup_root, now)
+        per_dir[str(state_dir)] = stats
+        for days in WINDOWS_D:
+            fleet[days] += counts[days]
+    if args.json:
+        output = {"state_dirs": per_dir}
+        if len(per_dir) > 1:
+            output["fleet"] = report(fleet)
+        print(json.dumps(output, indent=2))
+        return
+    for name, stats in per_dir.items():
+        print_text(name, stats)
+    if len(per_dir) > 1:
+        print_text("fleet", report(fleet))
+
+
+if __name__ == "__main__":
+    main()
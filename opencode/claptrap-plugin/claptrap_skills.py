@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Catalog of the Skills Claptrap can see, answered from a cache of their SKILL.md frontmatter."""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import claptrap_events
+
+CACHE_VERSION = 1  # the cache maps each SKILL.md path to [mtime_ns, size, frontmatter]
+DEFAULT_CACHE = Path.home() / ".cache/claptrap/skills-catalog.json"
+MANAGER = "ct-gardener"  # managed: a claptrap root, a ct- directory and metadata.managed-by: ct-gardener
+MANAGED_PREFIX = "ct-"
+BLOCK_SCALARS = ("|", "|-", "|+", ">", ">-", ">+")
+# bootstrap/install.py SKILL_ROOTS
+PROVIDER_ROOTS = {
+    "claude": Path.home() / ".claude/skills",
+    "cursor": Path.home() / ".cursor/skills",
+    "opencode": Path.home() / ".config/opencode/skills",
+}
+
+
+def unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+# A small YAML subset of the leading `---` block: `key: value`, one nested level (metadata:) and block scalars.
+# Reading stops at the closing `---`, so a Skill's body is never read.
+def read_frontmatter(path: Path) -> dict:
+    fields: dict = {}
+    section, scalar = None, None
+    with path.open(encoding="utf-8", errors="replace") as handle:
+        if handle.readline().strip() != "---":
+            return fields
+        for line in handle:
+            stripped = line.strip()
+            if stripped == "---":
+                break
+            indented = line[:1] in (" ", "\t")
+            if scalar is not None and (indented or not stripped):
+                fields[scalar] = f"{fields[scalar]} {stripped}".strip() if stripped else fields[scalar]
+                continue
+            scalar = None
+            if not stripped or stripped.startswith("#"):
+                continue
+            key, colon, value = stripped.partition(":")
+            if not colon:
+                continue
+            key, value = key.strip(), unquote(value.strip())
+            if indented and section is not None:
+                fields[section][key] = value
+            elif not indented and value in BLOCK_SCALARS:
+                fields[key], scalar, section = "", key, None
+            elif not indented and not value:
+                fields[key], section = {}, key
+            elif not indented:
+                fields[key], section = value, None
+    return fields
+
+
+# (root, attributes shared by every Skill under it), claptrap roots first.
+def skill_roots(projects: list[Path]) -> list[tuple[Path, dict]]:
+    roots = []
+    for scope, base in [("global", Path.home())] + [("project", project) for project in projects]:
+        for archived, relative in ((False, ".agents/skills/claptrap"), (True, ".agents/skills-archive/claptrap")):
+            attributes = {"scope": scope, "archived": archived, "claptrap": True}
+            if scope == "project":
+                attributes["project"] = str(base)
+            roots.append((base / relative, attributes))
+    for provider, root in PROVIDER_ROOTS.items():
+        roots.append((root, {"scope": "provider", "provider": provider, "archived": False, "claptrap": False}))
+    return roots
+
+
+# Projects the plugin has seen, from the pinned first `project_seen` per project; paths that are gone are skipped.
+def seen_projects(state_dir: Path | None = None) -> list[Path]:
+    pinned = (state_dir or claptrap_events.default_state_dir()) / "events" / claptrap_events.PINNED
+    projects = {event.get("project") for event in claptrap_events.read_lines(pinned) if event.get("event") == "project_seen"}
+    return sorted(Path(project) for project in projects if isinstance(project, str) and project and os.path.isdir(project))
+
+
+def load_cache(path: Path) -> dict:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache.get("files", {}) if isinstance(cache, dict) and cache.get("version") == CACHE_VERSION else {}
+
+
+def save_cache(path: Path, files: dict) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False) as temp:
+            json.dump({"version": CACHE_VERSION, "files": files}, temp, separators=(",", ":"))
+        os.replace(temp.name, path)
+    except OSError as error:
+        print(f"claptrap_skills: cannot write cache {path}: {error}", file=sys.stderr)
+
+
+# One entry per Skill directory under every root, with its frontmatter read through the cache.
+def catalog(projects: list[Path] | None = None, state_dir: Path | None = None, cache_path: Path | None = None) -> list[dict]:
+    cache_path = cache_path or DEFAULT_CACHE
+    cached = load_cache(cache_path)
+    files, entries, changed = {}, [], False
+    projects = seen_projects(state_dir) if projects is None else projects
+    for root, attributes in skill_roots(projects):
+        try:
+            directories = [entry for entry in os.scandir(root) if not entry.name.startswith(".") and entry.is_dir()]
+        except OSError:
+            continue
+        for directory in sorted(directories, key=lambda entry: entry.name):
+            skill_file = os.path.join(directory.path, "SKILL.md")
+            try:
+                stat = os.stat(skill_file)
+            except OSError:
+                continue
+            hit = cached.get(skill_file)
+            if hit and hit[0] == stat.st_mtime_ns and hit[1] == stat.st_size:
+                frontmatter = hit[2]
+            else:
+                try:
+                    frontmatter = read_frontmatter(Path(skill_file))
+                except OSError:
+                    continue
+                changed = True
+            files[skill_file] = [stat.st_mtime_ns, stat.st_size, frontmatter]
+            metadata = frontmatter.get("metadata") if isinstance(frontmatter.get("metadata"), dict) else {}
+            managed_by = metadata.get("managed-by")
+            entries.append({
+                "name": frontmatter.get("name") or directory.name,
+                "directory": directory.name,
+                "path": skill_file,
+                **{key: value for key, value in attributes.items() if key != "claptrap"},
+                "managed": attributes["claptrap"] and directory.name.startswith(MANAGED_PREFIX) and managed_by == MANAGER,
+                "managed_by": managed_by,
+                "description": frontmatter.get("description", ""),
+            })
+    if changed or files.keys() != cached.keys():
+        save_cache(cache_path, files)
+    return entries
+
+
+# Entries matching every given filter; name is a glob matched against the frontmatter name or directory.
+def query(
+    entries: list[dict],
+    name: str | None = None,
+    managed: bool | None = None,
+    scope: str | None = None,
+    archived: bool | None = None,
+) -> list[dict]:
+    return [
+        entry
+        for entry in entries
+        if (name is None or fnmatch.fnmatchcase(entry["name"], name) or fnmatch.fnmatchcase(entry["directory"], name))
+        and (managed is None or entry["managed"] == managed)
+        and (scope is None or entry["scope"] == scope)
+        and (archived is None or entry["archived"] == archived)
+    ]
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--name", help="frontmatter name or directory, glob patterns allowed")
+    managed = parser.add_mutually_exclusive_group()
+    managed.add_argument("--managed", dest="managed", action="store_const", const=True, help="only gardener-managed Skills")
+    managed.add_argument(
+        "--unmanaged",
+        dest="managed",
+        action="store_const",
+        const=False,
+        help="only Skills the gardener must not touch",
+    )
+    parser.add_argument("--scope", choices=["global", "project", "provider"])
+    archived = parser.add_mutually_exclusive_group()
+    archived.add_argument(
+        "--archived",
+        dest="archived",
+        action="store_const",
+        const=True,
+        help="only skills-archive/claptrap Skills",
+    )
+    archived.add_argument("--active", dest="archived", action="store_const", const=False, help="leave out archived Skills")
+    parser.add_argument(
+        "--project",
+        action="append",
+        type=Path,
+        help="project root to include (default: projects the plugin has seen)",
+    )
+    parser.add_argument("--state-dir", type=Path, help="Claptrap state directory (default ~/.local/state/claptrap)")
+    parser.add_argument("--cache", type=Path, help=f"catalog cache (default {DEFAULT_CACHE})")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="print matching entries as JSON")
+    output.add_argument("--count", action="store_true", help="print the number of matching Skills")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    projects = seen_projects(args.state_dir) + [project.resolve() for project in args.project or []]
+    entries = catalog(sorted(set(projects)), cache_path=args.cache)
+    entries = query(entries, args.name, args.managed, args.scope, args.archived)
+    if args.count:
+        print(len(entries))
+    elif args.json:
+        print(json.dumps(entries, indent=2))
+    else:
+        for entry in entries:
+            where = entry.get("project") or entry.get("provider") or "~"
+            flags = ",".join(flag for flag in ("managed", "archived") if entry[flag]) or "-"
+            print(f"{entry['name']:<32} {entry['scope']:<8} {flags:<16} {where}")
+
+
+if __name__ == "__main__":
+    main()
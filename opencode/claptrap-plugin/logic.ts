@@ -41,6 +41,52 @@ export function pruneEvents(events: EventRecord[], now = Date.now()): EventRecor
   })
 }
 
+/** Events are stored as one JSONL segment per UTC day, named YYYY-MM-DD, so
+ *  retention drops whole files and a reader opens only the days it needs. The
+ *  first `project_seen` per project lives in a separate pinned segment: skill
+ *  counting needs every project ever seen, not just the last 30 days. */
+export const PINNED_SEGMENT = "pinned"
+const SEGMENT_RE = /^\d{4}-\d{2}-\d{2}$/
+
+export function segmentName(ts: number) {
+  return new Date(ts).toISOString().slice(0, 10)
+}
+
+export function isSegmentName(name: string) {
+  return SEGMENT_RE.test(name)
+}
+
+function segmentStart(name: string) {
+  return Date.parse(`${name}T00:00:00.000Z`)
+}
+
+/** Day segments whose whole day falls outside the retention window. */
+export function expiredSegments(names: string[], now = Date.now()) {
+  return names.filter((name) => isSegmentName(name) && segmentStart(name) + DAY_MS <= now - EVENT_RETENTION_MS)
+}
+
+/** Split a flat event history (the legacy single events.jsonl) into day
+ *  segments plus the pinned segment, applying the same retention as
+ *  pruneEvents. */
+export function partitionEvents(events: EventRecord[], now = Date.now()) {
+  const pinned: EventRecord[] = []
+  const segments = new Map<string, EventRecord[]>()
+  for (const event of pruneEvents(events, now)) {
+    if (event.event === "project_seen") {
+      pinned.push(event)
+      continue
+    }
+    const name = segmentName(eventTime(event))
+    let segment = segments.get(name)
+    if (!segment) {
+      segment = []
+      segments.set(name, segment)
+    }
+    segment.push(event)
+  }
+  return { pinned, segments }
+}
+
 export function classifyToolCall(input: ToolInput): TrackedEvent | undefined {
   if (input.tool === "skill") {
     const name = input.args?.name ?? input.args?.skill
@@ -173,6 +219,25 @@ export function classifyManagedSkillEdit(filePath: string):
   return match ? { event: "managed_skill_changed", name: match[1] } : undefined
 }
 
+const MANAGED_BY_RE = /^managed-by:\s*(["']?)ct-gardener\1$/
+
+/** The ownership marker: `managed-by: ct-gardener` nested under `metadata:`
+ *  in the leading frontmatter block, as claptrap_skills.py reads it. The same
+ *  words in the Skill body, or at the top level, do not count. */
+export function frontmatterIsManaged(text: string) {
+  const lines = text.split(/\r?\n/)
+  if (lines[0]?.trim() !== "---") return false
+  let inMetadata = false
+  for (const line of lines.slice(1)) {
+    const stripped = line.trim()
+    if (stripped === "---") return false
+    if (!stripped || stripped.startsWith("#")) continue
+    if (!/^[ \t]/.test(line)) inMetadata = stripped === "metadata:"
+    else if (inMetadata && MANAGED_BY_RE.test(stripped)) return true
+  }
+  return false
+}
+
 export function isGardenerDue(events: EventRecord[], now = Date.now()) {
   return !events.some((event) => {
     if (event.event !== "gardener_completed") return false
@@ -1,5 +1,5 @@
 import { type Plugin, type PluginInput, tool } from "@opencode-ai/plugin"
-import { appendFileSync, existsSync, mkdirSync, readFileSync, readdirSync, rmSync, statSync, writeFileSync } from "node:fs"
+import { appendFileSync, existsSync, mkdirSync, readFileSync, readdirSync, renameSync, rmSync, statSync, writeFileSync } from "node:fs"
 import { spawn } from "node:child_process"
 import { homedir } from "node:os"
 import { join } from "node:path"
@@ -10,14 +10,19 @@ import {
   classifyManagedSkillEdit,
   classifyToolCall,
   eventTime,
+  expiredSegments,
+  frontmatterIsManaged,
   isGardenerDue,
   isGardenerLive,
+  isSegmentName,
   newest,
   newGateState,
   needsFailureBackfill,
-  pruneEvents,
+  partitionEvents,
+  PINNED_SEGMENT,
   RECALL_REMINDER,
   recordSkillAnnouncement,
+  segmentName,
   shouldAnnounceSkillChange,
   shouldRunHarvester,
   shouldWarnStore,
@@ -31,7 +36,12 @@ import {
 const STATE_DIR = join(homedir(), ".local/state/claptrap")
 const CHILD_ENV = "CLAPTRAP_AGENT_CHILD"
 
-const EVENTS_FILE = join(STATE_DIR, "events.jsonl")
+// One JSONL segment per UTC day plus pinned.jsonl; see segmentName in logic.ts.
+// index.json lists the segments for readers outside the plugin
+// (claptrap_events.py); the plugin itself lists the directory.
+const EVENTS_DIR = join(STATE_DIR, "events")
+const INDEX_FILE = join(EVENTS_DIR, "index.json")
+const LEGACY_EVENTS_FILE = join(STATE_DIR, "events.jsonl")
 type AgentRun = {
   agent: string
   prefix: "gardener" | "harvester"
@@ -74,20 +84,36 @@ function timestamp() {
 }
 
 function ensureStateDirectory() {
-  mkdirSync(STATE_DIR, { recursive: true })
+  mkdirSync(EVENTS_DIR, { recursive: true })
 }
 
-function appendEvent(event: Omit<EventRecord, "ts">): EventRecord {
-  ensureStateDirectory()
-  const agent = process.env[CHILD_ENV]
-  const record = { ts: timestamp(), ...(agent ? { agent } : {}), ...event } as EventRecord
-  appendFileSync(EVENTS_FILE, `${JSON.stringify(record)}\n`)
-  return record
+function segmentPath(name: string) {
+  return join(EVENTS_DIR, `${name}.jsonl`)
 }
 
-function readEvents(): EventRecord[] {
-  if (!existsSync(EVENTS_FILE)) return []
-  return readFileSync(EVENTS_FILE, "utf8")
+function listSegments() {
+  try {
+    return readdirSync(EVENTS_DIR)
+      .filter((file) => file.endsWith(".jsonl"))
+      .map((file) => file.slice(0, -".jsonl".length))
+      .filter(isSegmentName)
+      .sort()
+  } catch {
+    return []
+  }
+}
+
+/** Rewritten only when a segment appears or expires, not per event. Written
+ *  to a temp file and renamed so a reader never sees half an index. */
+function writeIndex() {
+  const temp = `${INDEX_FILE}.${process.pid}.tmp`
+  writeFileSync(temp, `${JSON.stringify({ version: 1, pinned: `${PINNED_SEGMENT}.jsonl`, segments: listSegments() })}\n`)
+  renameSync(temp, INDEX_FILE)
+}
+
+function readSegment(path: string): EventRecord[] {
+  if (!existsSync(path)) return []
+  return readFileSync(path, "utf8")
     .split("\n")
     .filter(Boolean)
     .flatMap((line) => {
@@ -100,14 +126,73 @@ function readEvents(): EventRecord[] {
     })
 }
 
-/** Rewrite events.jsonl without old history. Read-then-write can drop an event
- *  appended concurrently by another OpenCode instance; acceptable for
- *  metadata-only telemetry, and only main sessions prune, once at startup. */
-function pruneEventsFile() {
-  const events = readEvents()
-  const pruned = pruneEvents(events)
-  if (pruned.length === events.length) return
-  writeFileSync(EVENTS_FILE, pruned.map((event) => JSON.stringify(event)).join("\n") + (pruned.length ? "\n" : ""))
+let pinnedProjects: Set<string> | undefined
+
+/** Only the first `project_seen` per project is kept (pruneEvents' rule), so
+ *  a repeat sighting is dropped here instead of being written and pruned. */
+function isNewProject(project: unknown) {
+  if (typeof project !== "string" || !project || project === "/") return false
+  pinnedProjects ??= new Set(readSegment(segmentPath(PINNED_SEGMENT)).map((event) => String(event.project)))
+  if (pinnedProjects.has(project)) return false
+  pinnedProjects.add(project)
+  return true
+}
+
+function appendEvent(event: Omit<EventRecord, "ts">): EventRecord {
+  ensureStateDirectory()
+  const agent = process.env[CHILD_ENV]
+  const record = { ts: timestamp(), ...(agent ? { agent } : {}), ...event } as EventRecord
+  if (record.event === "project_seen") {
+    if (isNewProject(record.project)) appendFileSync(segmentPath(PINNED_SEGMENT), `${JSON.stringify(record)}\n`)
+    return record
+  }
+  const path = segmentPath(segmentName(eventTime(record)))
+  const fresh = !existsSync(path)
+  appendFileSync(path, `${JSON.stringify(record)}\n`)
+  if (fresh) writeIndex()
+  return record
+}
+
+/** Pinned events plus every retained day segment (at most ~31 files). */
+function readEvents(): EventRecord[] {
+  return [
+    ...readSegment(segmentPath(PINNED_SEGMENT)),
+    ...listSegments().flatMap((name) => readSegment(segmentPath(name))),
+  ]
+}
+
+/** Fold a pre-segment events.jsonl into the segments. It is renamed first, so
+ *  a gardener wrapper started by an older plugin that appends to the old path
+ *  afterwards just recreates it, and the next startup folds that in too. */
+function migrateLegacyEvents() {
+  // Per process, so of two instances starting together only the one whose
+  // rename wins folds the file in; the other finds nothing to move.
+  const migrating = `${LEGACY_EVENTS_FILE}.${process.pid}.migrating`
+  try {
+    renameSync(LEGACY_EVENTS_FILE, migrating)
+  } catch (error) {
+    if ((error as NodeJS.ErrnoException)?.code === "ENOENT") return
+    throw error
+  }
+  const { pinned, segments } = partitionEvents(readSegment(migrating))
+  const newProjects = pinned.filter((event) => isNewProject(event.project))
+  if (newProjects.length) {
+    appendFileSync(segmentPath(PINNED_SEGMENT), newProjects.map((event) => `${JSON.stringify(event)}\n`).join(""))
+  }
+  for (const [name, events] of segments) {
+    appendFileSync(segmentPath(name), events.map((event) => `${JSON.stringify(event)}\n`).join(""))
+  }
+  rmSync(migrating, { force: true })
+}
+
+/** Retention is deleting whole day files: no read-modify-write, so unlike the
+ *  old single-file rewrite it cannot drop an event another instance is
+ *  appending. Only main sessions prune, once at startup. */
+function pruneEventSegments() {
+  ensureStateDirectory()
+  migrateLegacyEvents()
+  for (const name of expiredSegments(listSegments())) rmSync(segmentPath(name), { force: true })
+  writeIndex()
 }
 
 function projectFor(ctx: PluginInput) {
@@ -242,7 +327,20 @@ function appendResultFromShell(event: string) {
   // %3N is GNU date only. On BSD/macOS this writes a malformed ts that parses
   // to 0, making every result look older than its start and triggering a
   // spurious failure backfill. Fine on this Linux host; port before reuse.
-  return `printf '{"ts":"%s","event":"${event}"}\\n' "$(date -u +%Y-%m-%dT%H:%M:%S.%3NZ)" >> ${shellQuote(EVENTS_FILE)}`
+  // The day segment is cut from the same timestamp, so an event written at
+  // midnight lands in the segment its ts belongs to. A result that opens a new
+  // segment rewrites index.json the way writeIndex does, so claptrap_events.py
+  // sees the day before the plugin next writes.
+  const dir = shellQuote(EVENTS_DIR)
+  const temp = `${shellQuote(INDEX_FILE)}.$$.tmp`
+  return [
+    `now=$(date -u +%Y-%m-%dT%H:%M:%S.%3NZ); segment=${dir}/"\${now%%T*}.jsonl"; fresh=; [ -e "$segment" ] || fresh=1`,
+    `printf '{"ts":"%s","event":"${event}"}\\n' "$now" >> "$segment"`,
+    `if [ -n "$fresh" ]; then`,
+    `  list=; for name in ${dir}/[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9].jsonl; do name=\${name##*/}; list="\${list:+$list,}\\"\${name%.jsonl}\\""; done`,
+    `  printf '{"version":1,"pinned":"${PINNED_SEGMENT}.jsonl","segments":[%s]}\\n' "$list" > ${temp} && mv -f ${temp} ${shellQuote(INDEX_FILE)}`,
+    `fi`,
+  ].join("\n  ")
 }
 
 function runBackgroundAgent(
@@ -370,7 +468,7 @@ function reconcileAndSchedule(ctx: PluginInput, sessionID?: string) {
 
 function skillFileIsManaged(path: string) {
   try {
-    return readFileSync(path, "utf8").includes("managed-by: ct-gardener")
+    return frontmatterIsManaged(readFileSync(path, "utf8"))
   } catch {
     return false
   }
@@ -389,8 +487,10 @@ function scanSkillRoot(root: string) {
   return count
 }
 
-function skillCounts(ctx: PluginInput, events: EventRecord[]) {
-  const projects = new Set<string>([ctx.worktree, ctx.directory])
+function skillCounts(events: EventRecord[]) {
+  // Pinned projects only, the set claptrap_skills.py reads; this session's
+  // project was pinned at startup.
+  const projects = new Set<string>()
   for (const event of events) if (event.event === "project_seen" && typeof event.project === "string") projects.add(event.project)
   let active = scanSkillRoot(join(homedir(), ".agents/skills/claptrap"))
   let archived = scanSkillRoot(join(homedir(), ".agents/skills-archive/claptrap"))
@@ -417,7 +517,7 @@ const ClaptrapPlugin: Plugin = async (ctx) => {
   const pendingSkillNotes: string[] = []
 
   if (!process.env[CHILD_ENV]) {
-    pruneEventsFile()
+    pruneEventSegments()
     reconcileAndSchedule(ctx)
   }
 
@@ -443,7 +543,7 @@ const ClaptrapPlugin: Plugin = async (ctx) => {
             harvesterSummaryText: summary(HARVESTER),
             running: isGardenerLive(readLockState(GARDENER)),
             harvesterRunning: isGardenerLive(readLockState(HARVESTER)),
-            skillCounts: skillCounts(ctx, events),
+            skillCounts: skillCounts(events),
           })
         },
       }),
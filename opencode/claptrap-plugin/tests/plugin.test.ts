@@ -4,7 +4,11 @@ import {
   classifyManagedSkillBashCommand,
   classifyManagedSkillEdit,
   classifyToolCall,
+  frontmatterIsManaged,
   pruneEvents,
+  expiredSegments,
+  partitionEvents,
+  segmentName,
   HARVESTER_THRESHOLD,
   applyToolToGate,
   isMutatingTool,
@@ -59,6 +63,14 @@ test("detects only managed-skill path shapes", () => {
   expect(classifyManagedSkillEdit("/x/skills/claptrap/ct-foo/README.md")).toBeUndefined()
 })
 
+test("reads managed-by only under metadata in the frontmatter", () => {
+  expect(frontmatterIsManaged("---\nname: ct-a\nmetadata:\n  managed-by: ct-gardener\n---\nBody\n")).toBe(true)
+  expect(frontmatterIsManaged("---\nmetadata:\n  version: 1\n  managed-by: 'ct-gardener'\n---\n")).toBe(true)
+  expect(frontmatterIsManaged("---\nname: ct-a\nmanaged-by: ct-gardener\n---\n")).toBe(false)
+  expect(frontmatterIsManaged("---\nname: ct-a\n---\nmetadata:\n  managed-by: ct-gardener\n")).toBe(false)
+  expect(frontmatterIsManaged("---\nmetadata:\n  managed-by: ct-skill-harvester\n---\n")).toBe(false)
+})
+
 test("flags bash commands only when a write indicator precedes the managed path", () => {
   const changed = { event: "managed_skill_changed", name: "ct-foo" }
   expect(classifyManagedSkillBashCommand("echo hi >> ~/.agents/skills/claptrap/ct-foo/SKILL.md")).toEqual(changed)
@@ -92,6 +104,41 @@ test("prunes old events but keeps one project_seen per real project", () => {
   ])
 })
 
+test("names day segments by UTC date", () => {
+  expect(segmentName(Date.parse("2026-08-01T23:59:59.999Z"))).toBe("2026-08-01")
+  expect(segmentName(Date.parse("2026-08-02T00:00:00.000Z"))).toBe("2026-08-02")
+})
+
+test("expires only segments wholly outside the retention window", () => {
+  const now = Date.parse("2026-08-31T12:00:00.000Z")
+  // 30 days back is 2026-08-01T12:00Z: July 31 is entirely older, August 1 still holds retained events.
+  expect(expiredSegments(["2026-07-30", "2026-07-31", "2026-08-01", "2026-08-31", "pinned", "index"], now)).toEqual([
+    "2026-07-30",
+    "2026-07-31",
+  ])
+})
+
+test("partitions a legacy log into pinned projects and day segments", () => {
+  const now = Date.parse("2026-08-02T00:00:00.000Z")
+  const { pinned, segments } = partitionEvents(
+    [
+      event("project_seen", now - 100 * day, { project: "/repo" }),
+      event("skill_loaded", now - 40 * day, { name: "ct-old" }),
+      event("skill_loaded", now - day, { name: "ct-a" }),
+      event("project_seen", now - day, { project: "/repo" }),
+      event("gardener_completed", now - 1000),
+    ],
+    now,
+  )
+
+  expect(pinned).toEqual([event("project_seen", now - 100 * day, { project: "/repo" })])
+  expect([...segments.keys()]).toEqual(["2026-08-01"])
+  expect(segments.get("2026-08-01")).toEqual([
+    event("skill_loaded", now - day, { name: "ct-a" }),
+    event("gardener_completed", now - 1000),
+  ])
+})
+
 test("applies the seven-day gardener due rule", () => {
   const now = Date.parse("2026-08-02T00:00:00.000Z")
   expect(isGardenerDue([], now)).toBe(true)
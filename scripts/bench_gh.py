@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Count processes, API calls and wall time per GitHub workflow operation against the local fake."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from fake_gh import FakeGitHub  # noqa: E402
+
+SPEC_SCRIPT = REPO_ROOT / "skills/dd-grill-me/scripts/gh_spec_create.py"
+PLAN_SCRIPT = REPO_ROOT / "skills/dd-writing-plans/scripts/gh_plan_create.py"
+BODY_SCRIPT = REPO_ROOT / "skills/dd-writing-plans/scripts/gh_issue_body.py"
+BULK_PLANS = 5
+
+# (max spawned processes, max API calls) per operation and cache state. Lower these when an optimization lands.
+# "cold" starts with an empty metadata cache, "warm" reuses the one the cold run left; exceeding a budget exits 1.
+BUDGETS = {
+    ("spec", "cold"): (2, 2),
+    ("spec", "warm"): (1, 1),
+    ("plan", "cold"): (2, 4),
+    ("plan", "warm"): (1, 2),
+    ("plan-graphql", "cold"): (2, 3),
+    ("plan-graphql", "warm"): (1, 2),
+    ("plans-bulk", "cold"): (2, 4 + BULK_PLANS),
+    ("plans-bulk", "warm"): (1, 3 + BULK_PLANS),
+    ("body", "cold"): (2, 2),
+    ("body", "warm"): (1, 2),
+    ("body-unchanged", "cold"): (2, 1),
+    ("body-unchanged", "warm"): (1, 1),
+}
+
+SHIM = """#!/bin/sh
+printf '%s\\n' "{name} $*" >> "$BENCH_SPAWN_LOG"
+exec {target} "$@"
+"""
+
+
+def operations(workdir: Path, tag: str) -> dict[str, list[str]]:
+    # Titles and bodies carry the run tag so every run creates or edits something instead of finding it done.
+    manifest = workdir / "plans.json"
+    manifest.write_text(json.dumps([{"title": f"Bench plan {tag} {i}", "body": "Plan body"} for i in range(BULK_PLANS)]))
+    python = sys.executable
+    return {
+        "spec": [python, str(SPEC_SCRIPT), "--title", "Bench spec", "--body-text", "Spec body"],
+        "plan": [python, str(PLAN_SCRIPT), "--parent", "1", "--title", "Bench plan", "--body-text", "Plan body"],
+        "plan-graphql": [
+            python, str(PLAN_SCRIPT), "--parent", "1", "--graphql", "--title", "Bench plan", "--body-text", "Plan body",
+        ],
+        "plans-bulk": [python, str(PLAN_SCRIPT), "--parent", "1", "--manifest", str(manifest)],
+        "body": [python, str(BODY_SCRIPT), "--issue", "1", "--body-text", f"Body {tag}"],
+        "body-unchanged": [python, str(BODY_SCRIPT), "--issue", "1", "--body-text", ""],
+    }
+
+
+def make_shims(bin_dir: Path) -> None:
+    bin_dir.mkdir()
+    real_git = shutil.which("git")
+    if real_git is None:
+        raise SystemExit("git is not on PATH")
+    targets = {"gh": f"{sys.executable} {REPO_ROOT / 'scripts/fake_gh.py'}", "git": real_git}
+    for name, target in targets.items():
+        shim = bin_dir / name
+        shim.write_text(SHIM.format(name=name, target=target))
+        shim.chmod(0o755)
+
+
+def make_repo(path: Path, fake: FakeGitHub) -> None:
+    path.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+    subprocess.run(["git", "remote", "add", "origin", f"git@github.com:{fake.owner}/{fake.repo}.git"], cwd=path, check=True)
+
+
+def run_once(fake: FakeGitHub, cmd: list[str], workdir: Path, env: dict[str, str]) -> dict:
+    spawn_log = workdir / "spawns.log"
+    spawn_log.write_text("")
+    before = len(fake.calls)
+    started = time.monotonic()
+    result = subprocess.run(cmd, cwd=workdir / "repo", env={**env, "BENCH_SPAWN_LOG": str(spawn_log)},
+                            capture_output=True, text=True, check=False)
+    elapsed = time.monotonic() - started
+    if result.returncode != 0:
+        raise SystemExit(f"{' '.join(cmd)} failed:\n{result.stderr}")
+    spawns = spawn_log.read_text().splitlines()
+    return {
+        "processes": len(spawns),  # every gh/git the script started; the script itself is not counted
+        "api_calls": len(fake.calls) - before,
+        "wall_s": elapsed,
+        "spawned": sorted({line.split(" ", 2)[0] + " " + line.split(" ", 2)[1] for line in spawns if " " in line}),
+    }
+
+
+def bench(args: argparse.Namespace) -> list[dict]:
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="claptrap-bench-") as temp:
+        workdir = Path(temp)
+        make_shims(workdir / "bin")
+        make_repo(workdir / "repo", FakeGitHub())
+        env = {key: value for key, value in os.environ.items() if key not in ("GH_TOKEN", "GITHUB_TOKEN")}
+        env["PATH"] = f"{workdir / 'bin'}{os.pathsep}{env.get('PATH', '')}"
+        for name in operations(workdir, "probe"):
+            if args.only and name not in args.only:
+                continue
+            samples: dict[str, list[dict]] = {"cold": [], "warm": []}
+            for run in range(args.runs):
+                # A fresh fake per run, so "cold" also means no label or issue left behind by an earlier sample.
+                fake = FakeGitHub(issues=1, latency_ms=args.latency_ms)
+                cache_file = workdir / f"cache-{name}-{run}.json"
+                run_env = {**env, "CLAPTRAP_GH_API_URL": fake.start(), "CLAPTRAP_GH_CACHE": str(cache_file)}
+                try:
+                    for cache in ("cold", "warm"):
+                        cmd = operations(workdir, f"{cache}-{run}")[name]
+                        if name == "body-unchanged":
+                            cmd[-1] = fake.issues[1]["body"]
+                        samples[cache].append(run_once(fake, cmd, workdir, run_env))
+                finally:
+                    fake.stop()
+            for cache, runs in samples.items():
+                rows.append({
+                    "operation": name,
+                    "cache": cache,
+                    "processes": max(sample["processes"] for sample in runs),
+                    "api_calls": max(sample["api_calls"] for sample in runs),
+                    "wall_s": round(statistics.median(sample["wall_s"] for sample in runs), 3),
+                    "spawned": runs[0]["spawned"],
+                    "budget": BUDGETS.get((name, cache)),
+                })
+    return rows
+
+
+def over_budget(row: dict) -> bool:
+    budget = row["budget"]
+    return budget is not None and (row["processes"] > budget[0] or row["api_calls"] > budget[1])
+
+
+def print_table(rows: list[dict], latency_ms: float) -> None:
+    print(f"injected latency: {latency_ms:g} ms per API call")
+    print(f"{'operation':<16} {'cache':<5} {'spawn':>5} {'calls':>5} {'wall_s':>7}  budget   spawned")
+    for row in rows:
+        budget = "-" if row["budget"] is None else f"{row['budget'][0]}/{row['budget'][1]}"
+        flag = "  OVER" if over_budget(row) else ""
+        print(f"{row['operation']:<16} {row['cache']:<5} {row['processes']:>5} {row['api_calls']:>5} "
+              f"{row['wall_s']:>7.3f}  {budget:<8} {', '.join(row['spawned']) or '-'}{flag}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay the fake adds to every API response")
+    parser.add_argument("-n", "--runs", type=int, default=1, help="runs per operation; wall time is the median")
+    parser.add_argument("--only", action="append", help="operation to run (repeatable); default is all")
+    parser.add_argument("--json", action="store_true", help="print rows as JSON instead of a table")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rows = bench(args)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows, args.latency_ms)
+    over = [row for row in rows if over_budget(row)]
+    if over:
+        for row in over:
+            print(f"over budget: {row['operation']} ({row['cache']}): {row['processes']} processes, "
+                  f"{row['api_calls']} API calls, budget {row['budget'][0]}/{row['budget'][1]}", file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
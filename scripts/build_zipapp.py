@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Build dist/claptrap.pyz, a single-file zipapp of bootstrap/claptrap.py and the scripts it dispatches to."""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+import tempfile
+import zipapp
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "bootstrap"))
+
+from claptrap import COMMANDS  # noqa: E402
+
+DEFAULT_OUTPUT = REPO_ROOT / "dist/claptrap.pyz"
+VENDOR_DIRS = ["bootstrap", *sorted({str(path.relative_to(REPO_ROOT)) for path in REPO_ROOT.glob("skills/**/scripts")})]
+# install symlinks files from the checkout, so it is not useful from inside an archive.
+SKIPPED = {"install"}
+MAIN = """import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "bootstrap"))
+import claptrap
+claptrap.main()
+"""
+
+
+# Groups of same-named modules across script directories whose contents differ.
+def diverged_copies() -> list[list[Path]]:
+    copies: dict[str, list[Path]] = {}
+    for directory in VENDOR_DIRS:
+        for path in sorted((REPO_ROOT / directory).glob("*.py")):
+            copies.setdefault(path.name, []).append(path)
+    return [paths for paths in copies.values() if len({path.read_bytes() for path in paths}) > 1]
+
+
+def stage(staging: Path) -> None:
+    directories = {directory for command, (directory, _) in COMMANDS.items() if command not in SKIPPED}
+    for directory in sorted(directories):
+        for path in (REPO_ROOT / directory).glob("*.py"):
+            target = staging / directory / path.name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, target)
+        assets = (REPO_ROOT / directory).parent / "assets"
+        if assets.is_dir():
+            shutil.copytree(assets, staging / assets.relative_to(REPO_ROOT))
+    (staging / "bootstrap").mkdir(exist_ok=True)
+    shutil.copy2(REPO_ROOT / "bootstrap/claptrap.py", staging / "bootstrap/claptrap.py")
+    (staging / "__main__.py").write_text(MAIN, encoding="utf-8")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    default = DEFAULT_OUTPUT.relative_to(REPO_ROOT)
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_OUTPUT, help=f"archive path (default {default})")
+    parser.add_argument("--check", action="store_true", help="verify vendored copies are identical and build nothing")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    diverged = diverged_copies()
+    for paths in diverged:
+        print(f"vendored copies differ: {', '.join(str(path.relative_to(REPO_ROOT)) for path in paths)}", file=sys.stderr)
+    if diverged:
+        raise SystemExit(1)
+    if args.check:
+        print("vendored copies identical")
+        return
+    with tempfile.TemporaryDirectory() as temp:
+        staging = Path(temp) / "claptrap"
+        stage(staging)
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        zipapp.create_archive(staging, args.output, interpreter="/usr/bin/env python3", compressed=True)
+    print(f"wrote {args.output} ({args.output.stat().st_size // 1024} KiB)")
+
+
+if __name__ == "__main__":
+    main()
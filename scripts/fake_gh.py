@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""Scriptable offline stand-in for `gh` and the GitHub API used by the dd-* gh scripts: `serve`, `auth token` and `soak`."""
+
+# Point the scripts at a running server with CLAPTRAP_GH_API_URL=http://127.0.0.1:<port> and GH_TOKEN=fake. Only the
+# REST and GraphQL operations the scripts send are implemented; anything else answers 404 so a new call shows up.
+
+from __future__ import annotations
+
+import argparse
+import http.server
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+CLIENT_DIR = Path(__file__).resolve().parents[1] / "skills/dd-writing-plans/scripts"
+FAKE_TOKEN = "fake-token"
+PAGE_SIZE = 100
+
+MUTATION_FIELD_RE = re.compile(
+    r"(?:(\w+)\s*:\s*)?"
+    r"(createIssue|updateIssue|createLabel|updateLabel|addLabelsToLabelable|addSubIssue)\(input:\s*\{(.*?)\}\)",
+    re.S,
+)
+ARGUMENT_RE = re.compile(r"(\w+):\s*(\$\w+|\"[^\"]*\"|\[[^\]]*\])")
+ISSUE_ALIAS_RE = re.compile(r"(\w+):\s*issue\(number:\s*(\d+)\)")
+
+
+class FakeGitHub:
+    def __init__(
+        self,
+        owner: str = "octo",
+        repo: str = "claptrap",
+        issues: int = 1,
+        latency_ms: float = 0,
+        rate_limit_every: int = 0,
+        rate_limit_status: int = 403,
+        retry_after: int = 1,
+        error_every: int = 0,
+        log: str | None = None,
+    ):
+        self.owner, self.repo = owner, repo
+        self.latency_s = latency_ms / 1000
+        self.rate_limit_every, self.rate_limit_status, self.retry_after = rate_limit_every, rate_limit_status, retry_after
+        self.error_every = error_every
+        self.log = Path(log) if log else None
+        self.lock = threading.Lock()
+        self.count = 0
+        self.calls: list[dict] = []
+        self.labels: dict[str, dict] = {}
+        self.issues: dict[int, dict] = {}
+        for _ in range(issues):
+            self.new_issue(f"Issue {len(self.issues) + 1}", "", [])
+        self.server: http.server.ThreadingHTTPServer | None = None
+
+    def new_issue(self, title: str, body: str, labels: list[str]) -> dict:
+        number = len(self.issues) + 1
+        for name in labels:
+            self.labels.setdefault(name, {"name": name, "color": "ededed", "description": ""})
+        issue = {"number": number, "title": title, "body": body, "labels": list(labels), "parent": None, "subs": []}
+        self.issues[number] = issue
+        return issue
+
+    def issue_by_node(self, node_id: str) -> dict | None:
+        return self.issues.get(int(node_id.removeprefix("I_"))) if node_id.startswith("I_") else None
+
+    def link(self, parent: dict, child: dict) -> str | None:
+        if child["parent"] is not None:
+            return "Sub issue may only have one parent"
+        child["parent"] = parent["number"]
+        parent["subs"].append(child["number"])
+        return None
+
+    def url(self, number: int) -> str:
+        return f"https://github.com/{self.owner}/{self.repo}/issues/{number}"
+
+    def rest_issue(self, issue: dict) -> dict:
+        return {
+            "number": issue["number"],
+            "id": issue["number"] * 1000 + 7,
+            "node_id": f"I_{issue['number']}",
+            "title": issue["title"],
+            "body": issue["body"],
+            "html_url": self.url(issue["number"]),
+            "labels": [{"name": name} for name in issue["labels"]],
+        }
+
+    def graphql_issue(self, issue: dict, sub_issues_after: int | None = 0) -> dict:
+        node = {
+            "id": f"I_{issue['number']}",
+            "number": issue["number"],
+            "title": issue["title"],
+            "body": issue["body"],
+            "url": self.url(issue["number"]),
+            "labels": {"nodes": [{"name": name} for name in issue["labels"]]},
+            "parent": {"number": issue["parent"]} if issue["parent"] else None,
+        }
+        if sub_issues_after is not None:
+            page = issue["subs"][sub_issues_after:sub_issues_after + PAGE_SIZE]
+            end = sub_issues_after + len(page)
+            node["subIssues"] = {
+                "nodes": [self.graphql_issue(self.issues[number], None) for number in page],
+                "pageInfo": {"hasNextPage": end < len(issue["subs"]), "endCursor": str(end)},
+            }
+        return node
+
+    def graphql_label(self, name: str) -> dict | None:
+        label = self.labels.get(name)
+        return label and {"id": f"L_{name}", "color": label["color"], "description": label["description"]}
+
+    def rest(self, method: str, path: str, query: dict, body: dict | None) -> tuple[int, object]:
+        base = f"/repos/{self.owner}/{self.repo}"
+        if not path.startswith(base):
+            return 404, {"message": "Not Found"}
+        parts = path[len(base):].strip("/").split("/")
+        if parts == ["labels"] and method == "POST":
+            if body["name"] in self.labels:
+                return 422, {"message": "Validation Failed", "errors": [{"code": "already_exists"}]}
+            self.labels[body["name"]] = {key: body.get(key, "") for key in ("name", "color", "description")}
+            return 201, self.labels[body["name"]]
+        if len(parts) == 2 and parts[0] == "labels" and method == "PATCH":
+            if parts[1] not in self.labels:
+                return 404, {"message": "Not Found"}
+            self.labels[parts[1]].update({key: body[key] for key in ("color", "description") if key in body})
+            return 200, self.labels[parts[1]]
+        if parts == ["issues"] and method == "POST":
+            return 201, self.rest_issue(self.new_issue(body["title"], body.get("body", ""), body.get("labels", [])))
+        if len(parts) < 2 or parts[0] != "issues" or not parts[1].isdigit():
+            return 404, {"message": "Not Found"}
+        issue = self.issues.get(int(parts[1]))
+        if issue is None:
+            return 404, {"message": "Not Found"}
+        action = tuple(parts[2:])
+        if action == () and method == "GET":
+            return 200, self.rest_issue(issue)
+        if action == () and method == "PATCH":
+            issue.update({key: body[key] for key in ("title", "body") if key in body})
+            return 200, self.rest_issue(issue)
+        if action == ("labels",) and method == "POST":
+            for name in body["labels"]:
+                self.labels.setdefault(name, {"name": name, "color": "ededed", "description": ""})
+                if name not in issue["labels"]:
+                    issue["labels"].append(name)
+            return 200, [{"name": name} for name in issue["labels"]]
+        if action == ("comments",) and method == "POST":
+            return 201, {"body": body["body"]}
+        if action == ("sub_issues",) and method == "GET":
+            per_page = int(query.get("per_page", ["30"])[0])
+            page = int(query.get("page", ["1"])[0])
+            numbers = issue["subs"][(page - 1) * per_page:page * per_page]
+            return 200, [self.rest_issue(self.issues[number]) for number in numbers]
+        if action == ("sub_issues",) and method == "POST":
+            child = self.issues.get((int(body["sub_issue_id"]) - 7) // 1000)
+            if child is None:
+                return 404, {"message": "Not Found"}
+            error = self.link(issue, child)
+            return (422, {"message": error}) if error else (201, self.rest_issue(issue))
+        return 404, {"message": "Not Found"}
+
+    def resolve(self, token: str, variables: dict) -> object:
+        if token.startswith("$"):
+            return variables.get(token[1:])
+        if token.startswith('"'):
+            return token[1:-1]
+        return [self.resolve(item.strip(), variables) for item in token[1:-1].split(",") if item.strip()]
+
+    def mutation(self, query: str, variables: dict) -> tuple[dict, list[dict]]:
+        data, errors = {}, []
+        for alias, field, arguments in MUTATION_FIELD_RE.findall(query):
+            args = {name: self.resolve(value, variables) for name, value in ARGUMENT_RE.findall(arguments)}
+            key = alias or field
+            if field == "createIssue":
+                names = [name.removeprefix("L_") for name in args.get("labelIds") or []]
+                issue = self.new_issue(args["title"], args.get("body", ""), names)
+                parent = self.issue_by_node(args["parentIssueId"]) if args.get("parentIssueId") else None
+                if parent:
+                    self.link(parent, issue)
+                data[key] = {"issue": self.graphql_issue(issue, None)}
+            elif field == "updateIssue":
+                issue = self.issue_by_node(args["id"])
+                issue["body"] = args.get("body", issue["body"])
+                data[key] = {"clientMutationId": None}
+            elif field in ("createLabel", "updateLabel"):
+                name = args.get("name") or args["id"].removeprefix("L_")
+                self.labels.setdefault(name, {"name": name, "color": "", "description": ""})
+                self.labels[name].update({"color": args["color"], "description": args["description"]})
+                data[key] = {"label": {"id": f"L_{name}"}}
+            elif field == "addLabelsToLabelable":
+                issue = self.issue_by_node(args["labelableId"])
+                names = [node.removeprefix("L_") for node in args["labelIds"]]
+                issue["labels"] += [name for name in names if name not in issue["labels"]]
+                data[key] = {"clientMutationId": None}
+            else:
+                error = self.link(self.issue_by_node(args["issueId"]), self.issue_by_node(args["subIssueId"]))
+                data[key] = None if error else {"clientMutationId": None}
+                if error:
+                    errors.append({"type": "UNPROCESSABLE", "path": [key], "message": error})
+        return data, errors
+
+    def query(self, query: str, variables: dict) -> tuple[dict, list[dict]]:
+        if "node(id:" in query:
+            parent = self.issue_by_node(variables["parent"])
+            return {"node": self.graphql_issue(parent, int(variables.get("after") or 0))}, []
+        repository, errors = {"id": "R_1"}, []
+        label = re.search(r'label\(name:\s*"([^"]+)"\)', query)
+        if label:
+            repository["label"] = self.graphql_label(label.group(1))
+        for alias, variable in (("parent", "parent"), ("plan", "issue")):
+            if f"{alias}: issue(" not in query or (alias == "plan" and not variables.get("resume")):
+                continue
+            issue = self.issues.get(variables[variable])
+            repository[alias] = issue and self.graphql_issue(issue)
+            if issue is None:
+                message = f"Could not resolve to an Issue with the number of {variables[variable]}."
+                errors.append({"type": "NOT_FOUND", "message": message})
+        if "plans: issues(" in query:
+            plans = [issue for issue in reversed(self.issues.values()) if "plan" in issue["labels"]]
+            start = int(variables.get("after") or 0)
+            end = start + len(plans[start:start + PAGE_SIZE])
+            repository["plans"] = {
+                "nodes": [self.graphql_issue(issue, None) for issue in plans[start:end]],
+                "pageInfo": {"hasNextPage": end < len(plans), "endCursor": str(end)},
+            }
+        for alias, number in ISSUE_ALIAS_RE.findall(query):
+            issue = self.issues.get(int(number))
+            repository[alias] = issue and self.graphql_issue(issue, None)
+        return {"repository": repository}, errors
+
+    def graphql(self, body: dict) -> tuple[int, dict]:
+        query, variables = body["query"], body.get("variables") or {}
+        handler = self.mutation if query.lstrip().startswith("mutation") else self.query
+        data, errors = handler(query, variables)
+        return 200, {"data": data, **({"errors": errors} if errors else {})}
+
+    def injected(self, number: int) -> tuple[int, dict, dict] | None:
+        if self.rate_limit_every and number % self.rate_limit_every == 0:
+            headers = {"Retry-After": str(self.retry_after), "X-RateLimit-Remaining": "4000"}
+            return self.rate_limit_status, headers, {"message": "You have exceeded a secondary rate limit."}
+        if self.error_every and number % self.error_every == 0:
+            return 502, {}, {"message": "Server Error"}
+        return None
+
+    def handle(self, method: str, target: str, body: dict | None) -> tuple[int, dict, object]:
+        url = urlsplit(target)
+        with self.lock:
+            self.count += 1
+            number = self.count
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        injected = self.injected(number)
+        with self.lock:
+            if injected:
+                status, headers, payload = injected
+            elif url.path == "/graphql" and method == "POST":
+                status, payload = self.graphql(body)
+                headers = {}
+            else:
+                status, payload = self.rest(method, url.path, parse_qs(url.query), body)
+                headers = {}
+            operation = ""
+            if url.path == "/graphql" and body:
+                operation = " ".join(sorted({field for _, field, _ in MUTATION_FIELD_RE.findall(body["query"])})) or "query"
+            call = {"ts": time.time(), "method": method, "path": url.path, "status": status, "operation": operation}
+            self.calls.append(call)
+            if self.log:
+                with self.log.open("a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(call) + "\n")
+        return status, headers, payload
+
+    def start(self, port: int = 0) -> str:
+        fake = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like api.github.com
+
+            def log_message(self, *args):
+                pass
+
+            def dispatch(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                status, headers, payload = fake.handle(self.command, self.path, body)
+                raw = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                for key, value in {"Content-Type": "application/json", **headers}.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            do_GET = do_POST = do_PATCH = dispatch
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self) -> None:
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+def fake_from_args(args: argparse.Namespace) -> FakeGitHub:
+    owner, repo = args.repo.split("/", 1)
+    return FakeGitHub(
+        owner,
+        repo,
+        issues=args.issues,
+        latency_ms=args.latency_ms,
+        rate_limit_every=args.rate_limit_every,
+        rate_limit_status=args.rate_limit_status,
+        retry_after=args.retry_after,
+        error_every=args.error_every,
+        log=args.log,
+    )
+
+
+def serve(args: argparse.Namespace) -> None:
+    fake = fake_from_args(args)
+    print(f"CLAPTRAP_GH_API_URL={fake.start(args.port)}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+# Drive gh_client itself at the fake, so retry, backoff and the concurrency cap are exercised under sustained load.
+def soak(args: argparse.Namespace) -> None:
+    os.environ["CLAPTRAP_GH_MAX_CONCURRENCY"] = str(args.concurrency)
+    sys.path.insert(0, str(CLIENT_DIR))
+    import gh_client
+
+    fake = fake_from_args(args)
+    client = gh_client.GitHubClient(fake.start(), token=FAKE_TOKEN)
+    path = f"/repos/{fake.owner}/{fake.repo}/issues"
+
+    def create(index: int) -> bool:
+        try:
+            client.rest("POST", path, {"title": f"Soak {index}", "body": "", "labels": ["plan"]})
+        except gh_client.GitHubError as error:
+            print(f"request {index} failed: {error}", file=sys.stderr)
+            return False
+        return True
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(create, range(args.requests)))
+    elapsed = time.monotonic() - started
+    fake.stop()
+    failed = results.count(False)
+    report = {
+        "requests": args.requests,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(args.requests / elapsed, 2),
+        "http_calls": fake.count,
+        "rate_limited": sum(call["status"] in (403, 429) for call in fake.calls),
+        **{f"client_{key}": round(value, 3) for key, value in client.stats.items()},
+    }
+    print(json.dumps(report, indent=2))
+    if failed:
+        raise SystemExit(1)
+
+
+def add_fake_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--repo", default="octo/claptrap", help="owner/name the fake serves")
+    parser.add_argument("--issues", type=int, default=1, help="issues to pre-create (#1 is a ready parent spec)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every response")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth request with a rate limit")
+    parser.add_argument("--rate-limit-status", type=int, choices=[403, 429], default=403)
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with injected limits")
+    parser.add_argument("--error-every", type=int, default=0, help="answer every Nth request with a 502")
+    parser.add_argument("--log", help="append one JSON line per request to this file")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="run the stand-in API until interrupted")
+    serve_parser.add_argument("--port", type=int, default=0)
+    add_fake_options(serve_parser)
+    soak_parser = sub.add_parser("soak", help="measure gh_client throughput against an in-process fake")
+    soak_parser.add_argument("--requests", type=int, default=100)
+    soak_parser.add_argument("--workers", type=int, default=8)
+    soak_parser.add_argument("--concurrency", type=int, default=4, help="CLAPTRAP_GH_MAX_CONCURRENCY for the client")
+    add_fake_options(soak_parser)
+    auth_parser = sub.add_parser("auth", help="gh-compatible `auth token`")
+    auth_parser.add_argument("action", choices=["token"])
+    auth_parser.add_argument("--hostname")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    args = parse_args(sys.argv[1:])
+    if args.command == "auth":
+        print(os.environ.get("FAKE_GH_TOKEN", FAKE_TOKEN))
+    elif args.command == "serve":
+        serve(args)
+    else:
+        soak(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@
 import argparse, datetime as dt, html, json, sys
 from pathlib import Path
 from bs4 import BeautifulSoup
+import claptrap_trace
 
 SCHEMA = {"meta": {"state": "...", "last_action": "...", "last_updated": "YYYY-mm-dd H:M:S", "branch": "..."}, "summary": "...", "open": [{"spec": "...", "summary": "...", "plans": [{"file": "...", "summary": "...", "note": "optional"}]}], "archived": []}
 TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "assets/state.template.html"
@@ -41,7 +42,8 @@ def validate(payload):
 
 def read_state(path):
     if not path.exists(): return defaults()
-    soup = BeautifulSoup(path.read_text(encoding="utf-8"), "html.parser")
+    with claptrap_trace.span("file.read"): text = path.read_text(encoding="utf-8")
+    with claptrap_trace.span("html.parse"): soup = BeautifulSoup(text, "html.parser")
     script = soup.find("script", {"id": "state-data"})
     if script and script.string:
         try: return json.loads(script.string.strip())
@@ -71,16 +73,16 @@ def render_accordion(groups):
     return "".join(out)
 
 def render_html(data):
-    t = TEMPLATE_PATH.read_text(encoding="utf-8")
+    t = __loader__.get_data(str(TEMPLATE_PATH)).decode("utf-8")  # also reads from inside the claptrap zipapp
     state_json = json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
     repl = {"{{STATE}}": esc(data["meta"].get("state", "")), "{{LAST_ACTION}}": esc(data["meta"].get("last_action", "")), "{{LAST_UPDATED}}": esc(data["meta"].get("last_updated", "")), "{{BRANCH}}": esc(data["meta"].get("branch", "")), "{{SUMMARY}}": esc(data.get("summary", "")), "{{OPEN_ACCORDION}}": render_accordion(data.get("open", [])), "{{ARCHIVED_ACCORDION}}": render_accordion(data.get("archived", [])), "{{STATE_JSON}}": state_json}
     for k, v in repl.items(): t = t.replace(k, v)
     return t
 
-def main():
+def main(argv=None):
     p = argparse.ArgumentParser(add_help=False); p.add_argument("--help", action="store_true"); p.add_argument("--file", default=".planning/state.html")
     sub = p.add_subparsers(dest="cmd"); sub.add_parser("read", add_help=False); w = sub.add_parser("write", add_help=False); w.add_argument("--json", required=True)
-    a = p.parse_args()
+    a = p.parse_args(argv)
     if a.help or not a.cmd:
         print("Usage: state_io.py [--file .planning/state.html] read|write --json '<payload>'\nInfo: reads/writes structured state fields in HTML.\nFields: meta.state,last_action,last_updated,branch; summary; open[]; archived[].\nSchema: " + json.dumps(SCHEMA, separators=(",", ":")) + "\nPatch: write supports partial updates (only provided fields are changed)."); return
     path = Path(a.file); current = read_state(path)
@@ -90,7 +92,9 @@ def main():
     err = validate(patch)
     if err: print(schema_error(err), file=sys.stderr); sys.exit(1)
     merged = {"meta": {**current.get("meta", {}), **patch.get("meta", {})}, "summary": patch.get("summary", current.get("summary", "")), "open": patch.get("open", current.get("open", [])), "archived": patch.get("archived", current.get("archived", []))}
-    path.parent.mkdir(parents=True, exist_ok=True); path.write_text(render_html(merged), encoding="utf-8")
+    with claptrap_trace.span("render"): page = render_html(merged)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with claptrap_trace.span("write"): path.write_text(page, encoding="utf-8")
     print(json.dumps(merged, indent=2, ensure_ascii=False))
 
 if __name__ == "__main__": main()
@@ -7,13 +7,14 @@
 from __future__ import annotations
 
 import argparse
-import os
 import re
-import subprocess
 import sys
-import tempfile
 from pathlib import Path
 
+import claptrap_trace
+import gh_cache
+import gh_client
+
 
 def die(message: str) -> None:
     print(message, file=sys.stderr)
@@ -21,18 +22,27 @@ def die(message: str) -> None:
 
 
 def run(cmd: list[str]) -> str:
-    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    result = claptrap_trace.run(cmd, capture_output=True, text=True, check=False)
     if result.returncode != 0:
         stderr = result.stderr.strip() or result.stdout.strip()
         die(f"{' '.join(cmd)} failed: {stderr}")
     return result.stdout.strip()
 
 
-def gh(args: list[str]) -> str:
-    return run(["gh", *args])
+def api(method: str, path: str, body: object = None) -> object:
+    try:
+        return gh_client.get_client().rest(method, path, body)
+    except gh_client.GitHubError as error:
+        die(str(error))
 
 
 def detect_repo() -> tuple[str, str]:
+    workdir = str(Path.cwd().resolve())
+    # Reuse owner/repo only while the git config defining origin is unchanged, so a retargeted remote is re-read.
+    stamp = gh_cache.git_config_stamp(Path(workdir))
+    cached = gh_cache.get("remotes", workdir)
+    if stamp and cached and cached[2:] == [stamp]:
+        return cached[0], cached[1]
     url = run(["git", "remote", "get-url", "origin"]).strip()
     patterns = [
         r"git@github\.com:([^/]+)/(.+?)(?:\.git)?",
@@ -41,6 +51,7 @@ def detect_repo() -> tuple[str, str]:
     for pattern in patterns:
         match = re.fullmatch(pattern, url)
         if match:
+            gh_cache.put("remotes", workdir, [match.group(1), match.group(2), stamp], gh_cache.REMOTE_TTL_S)
             return match.group(1), match.group(2)
     die(f"cannot parse GitHub origin remote: {redact_url(url)}")
 
@@ -49,55 +60,35 @@ def redact_url(url: str) -> str:
     return re.sub(r"https://[^/@]+(?::[^/@]*)?@", "https://***@", url)
 
 
-def parse_issue_number(output: str) -> int:
-    match = re.search(r"/issues/(\d+)\b", output)
-    if not match:
-        match = re.search(r"#(\d+)\b", output)
-    if not match:
-        die(f"cannot parse issue number from gh issue create output: {output}")
-    return int(match.group(1))
-
-
-def parse_issue_url(output: str) -> str:
-    match = re.search(r"https://github\.com/\S+/\S+/issues/\d+", output)
-    if not match:
-        die(f"cannot parse issue URL from gh issue create output: {output}")
-    return match.group(0)
-
-
 SPEC_LABEL_COLOR = "5319e7"
 SPEC_LABEL_DESC = "Spec / design document"
 
 
-def ensure_spec_label(owner: str, repo: str) -> None:
+def ensure_spec_label(owner: str, repo: str, refresh: bool = False) -> None:
     """Create or update the 'spec' label matching the gitdash format."""
-    result = subprocess.run(
-        ["gh", "label", "create", "spec",
-         "--color", SPEC_LABEL_COLOR,
-         "--description", SPEC_LABEL_DESC,
-         "--repo", f"{owner}/{repo}"],
-        capture_output=True, text=True,
-    )
-    if result.returncode != 0:
-        # Label likely already exists — edit it to match the desired format
-        subprocess.run(
-            ["gh", "label", "edit", "spec",
-             "--color", SPEC_LABEL_COLOR,
-             "--description", SPEC_LABEL_DESC,
-             "--repo", f"{owner}/{repo}"],
-            capture_output=True, text=True, check=True,
-        )
-
-
-def issue_url_for(issue_number: int) -> str:
-    url = gh(["issue", "view", str(issue_number), "--json", "url", "--jq", ".url"])
-    if not url:
-        die(f"cannot determine URL for issue #{issue_number}")
-    return url
+    wanted = {"color": SPEC_LABEL_COLOR, "description": SPEC_LABEL_DESC}
+    if not refresh and gh_cache.get(f"{owner}/{repo}", "label:spec") == wanted:
+        return
+    try:
+        gh_client.get_client().rest("POST", f"/repos/{owner}/{repo}/labels", {"name": "spec", **wanted})
+    except gh_client.GitHubError as error:
+        if error.status != 422:
+            die(str(error))
+        # Label already exists — edit it to match the desired format
+        api("PATCH", f"/repos/{owner}/{repo}/labels/spec", wanted)
+    gh_cache.put(f"{owner}/{repo}", "label:spec", wanted, gh_cache.LABEL_TTL_S)
 
 
-def configure_spec(issue_number: int) -> None:
-    gh(["issue", "edit", str(issue_number), "--add-label", "spec"])
+def configure_spec(owner: str, repo: str, issue_number: int) -> None:
+    path = f"/repos/{owner}/{repo}/issues/{issue_number}/labels"
+    try:
+        gh_client.get_client().rest("POST", path, {"labels": ["spec"]})
+        return
+    except gh_client.GitHubError:
+        pass
+    # The cached label may be stale (deleted since it was cached); recreate it once before giving up.
+    ensure_spec_label(owner, repo, refresh=True)
+    api("POST", path, {"labels": ["spec"]})
 
 
 def create_spec(title: str | None, body: str | None, existing_issue: int | None) -> tuple[int, str]:
@@ -106,56 +97,44 @@ def create_spec(title: str | None, body: str | None, existing_issue: int | None)
     ensure_spec_label(owner, repo)
 
     if existing_issue is not None:
-        issue_number = existing_issue
-        issue_url = issue_url_for(issue_number)
-        print(f"Resuming: {issue_url}", file=sys.stderr)
+        issue = api("GET", f"/repos/{owner}/{repo}/issues/{existing_issue}")
+        print(f"Resuming: {issue['html_url']}", file=sys.stderr)
     else:
         if title is None or body is None:
             die("--title and --body-file/--body-text are required unless --issue is provided")
-        temp_path = ""
-        try:
-            with tempfile.NamedTemporaryFile("w", encoding="utf-8", delete=False) as temp:
-                temp.write(body)
-                temp_path = temp.name
-
-            created = gh(["issue", "create", "--title", title, "--body-file", temp_path])
-        finally:
-            if temp_path:
-                try:
-                    os.unlink(temp_path)
-                except OSError:
-                    pass
-
-        issue_number = parse_issue_number(created)
-        issue_url = parse_issue_url(created)
-        print(f"Created: {issue_url}", file=sys.stderr)
+        # Creating with the label applies it in the same request.
+        issue = api("POST", f"/repos/{owner}/{repo}/issues", {"title": title, "body": body, "labels": ["spec"]})
+        print(f"Created: {issue['html_url']}", file=sys.stderr)
 
+    issue_number = issue["number"]
     try:
-        configure_spec(issue_number)
+        if "spec" not in {label["name"] for label in issue["labels"]}:
+            configure_spec(owner, repo, issue_number)
     except SystemExit:
         print(f"Recovery: retry with --issue {issue_number} to finish labeling without creating a duplicate.", file=sys.stderr)
         raise
-    return issue_number, issue_url
+    return issue_number, issue["html_url"]
 
 
 def body_from_args(args: argparse.Namespace) -> str | None:
     if args.body_file:
-        return Path(args.body_file).read_text(encoding="utf-8")
+        with claptrap_trace.span("file.read"):
+            return Path(args.body_file).read_text(encoding="utf-8")
     return args.body_text
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--title")
     parser.add_argument("--issue", type=int, help="existing issue number to resume after partial failure")
     body_group = parser.add_mutually_exclusive_group()
     body_group.add_argument("--body-file")
     body_group.add_argument("--body-text")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main() -> None:
-    args = parse_args()
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
     issue_number, issue_url = create_spec(args.title, body_from_args(args), args.issue)
     print(f"issue_number={issue_number}")
     print(f"issue_url={issue_url}")
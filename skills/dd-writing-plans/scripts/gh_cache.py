@@ -0,0 +1,108 @@
+"""On-disk TTL cache for GitHub metadata the gh scripts would otherwise re-fetch on every run."""
+# Vendored into dd-grill-me/ and dd-writing-plans/scripts so each skill installs standalone; keep the copies identical.
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import claptrap_trace
+
+REMOTE_TTL_S = 24 * 60 * 60
+LABEL_TTL_S = 7 * 24 * 60 * 60
+ISSUE_ID_TTL_S = 30 * 24 * 60 * 60  # database ids never change; the TTL only bounds growth
+
+lock = threading.Lock()
+
+
+def cache_path() -> Path | None:
+    value = os.environ.get("CLAPTRAP_GH_CACHE", "")
+    if value.lower() in ("0", "off"):
+        return None
+    if value:
+        return Path(value).expanduser()
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "claptrap/gh-metadata.json"
+
+
+# Path, mtime and size of the git config files that define the repository's remotes, found without spawning git.
+# `git remote set-url` and friends rewrite .git/config, so a remote cached against this stamp is re-read after them.
+def git_config_stamp(workdir: Path) -> str | None:
+    git = Path(os.environ["GIT_DIR"]) if os.environ.get("GIT_DIR") else None
+    for directory in () if git else (workdir, *workdir.parents):
+        if (directory / ".git").exists():
+            git = directory / ".git"
+            break
+    if git is None:
+        return None
+    try:
+        if git.is_file():  # a linked worktree or submodule: "gitdir: <path>"
+            git = (git.parent / git.read_text(encoding="utf-8").removeprefix("gitdir:").strip()).resolve()
+            if (git / "commondir").is_file():
+                git = (git / (git / "commondir").read_text(encoding="utf-8").strip()).resolve()
+        stamps = []
+        for config in (git / "config", git / "config.worktree"):
+            if config.exists():
+                stat = config.stat()
+                stamps.append(f"{config}:{stat.st_mtime_ns}:{stat.st_size}")
+    except OSError:
+        return None
+    return ";".join(stamps) or None
+
+
+def load(path: Path) -> dict:
+    try:
+        with claptrap_trace.span("cache.read"):
+            data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save(path: Path, data: dict) -> None:
+    # Write-then-rename, so a concurrent reader sees either the old cache or the new one, never half a file.
+    with claptrap_trace.span("cache.write"):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False) as temp:
+            json.dump(data, temp, separators=(",", ":"))
+        os.replace(temp.name, path)
+
+
+def get(scope: str, key: str) -> object | None:
+    path = cache_path()
+    if path is None:
+        return None
+    entry = load(path).get(scope, {}).get(key)
+    if not isinstance(entry, dict) or entry.get("expires", 0) < time.time():
+        return None
+    return entry.get("value")
+
+
+def put(scope: str, key: str, value: object, ttl_s: int) -> None:
+    path = cache_path()
+    if path is None:
+        return
+    with lock:
+        data = load(path)  # re-read so entries written by another process since our last read survive
+        data.setdefault(scope, {})[key] = {"value": value, "expires": time.time() + ttl_s}
+        try:
+            save(path, data)
+        except OSError:
+            pass  # a cache that cannot be written is just a miss next time
+
+
+def drop(scope: str, key: str) -> None:
+    path = cache_path()
+    if path is None:
+        return
+    with lock:
+        data = load(path)
+        if data.get(scope, {}).pop(key, None) is None:
+            return
+        try:
+            save(path, data)
+        except OSError:
+            pass
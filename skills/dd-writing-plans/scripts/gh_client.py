@@ -0,0 +1,240 @@
+"""Pooled GitHub REST/GraphQL client for the gh scripts, replacing one `gh` subprocess per API call."""
+# Vendored into dd-grill-me/ and dd-writing-plans/scripts so each skill installs standalone; keep the copies identical.
+
+from __future__ import annotations
+
+import base64
+import http.client
+import ipaddress
+import json
+import os
+import queue
+import random
+import threading
+import time
+import urllib.parse
+
+import claptrap_trace
+
+DEFAULT_API_URL = "https://api.github.com"  # CLAPTRAP_GH_API_URL: a GHE root (https://host/api/v3) or fake_gh.py
+POOL_SIZE = 4
+TIMEOUT_S = 30
+API_VERSION = "2022-11-28"
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_S = 1.0
+BACKOFF_CAP_S = 60.0
+SECONDARY_LIMIT_WAIT_S = 60.0  # GitHub's guidance when a secondary limit carries no Retry-After
+MAX_WAIT_S = 15 * 60.0  # a primary limit resetting later than this is reported, not slept through
+MAX_CONCURRENCY = int(os.environ.get("CLAPTRAP_GH_MAX_CONCURRENCY") or 4)
+
+
+class GitHubError(Exception):
+    def __init__(self, status: int, message: str, headers: dict[str, str] | None = None):
+        super().__init__(f"HTTP {status}: {message}" if status else message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+def auth_token(host: str) -> str:
+    token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+    if token:
+        return token
+    cmd = ["gh", "auth", "token"] if host == "api.github.com" else ["gh", "auth", "token", "--hostname", host]
+    result = claptrap_trace.run(cmd, capture_output=True, text=True, check=False)
+    if result.returncode != 0 or not result.stdout.strip():
+        raise GitHubError(0, f"cannot read a GitHub token from gh: {result.stderr.strip() or 'empty token'}")
+    return result.stdout.strip()
+
+
+# The proxy gh would use for this API root: HTTPS_PROXY/HTTP_PROXY unless NO_PROXY matches or the host is loopback.
+def proxy_for(scheme: str, host: str) -> urllib.parse.SplitResult | None:
+    if not (os.environ.get(f"{scheme}_proxy") or os.environ.get(f"{scheme.upper()}_PROXY")):
+        return None
+    import urllib.request  # only when a proxy is configured
+
+    hostname = urllib.parse.urlsplit(f"//{host}").hostname or host
+    try:
+        loopback = hostname == "localhost" or ipaddress.ip_address(hostname).is_loopback
+    except ValueError:
+        loopback = False
+    proxy = urllib.request.getproxies_environment().get(scheme)
+    if not proxy or loopback or urllib.request.proxy_bypass_environment(host):
+        return None
+    return urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+
+def backoff(attempt: int) -> float:
+    return min(BACKOFF_CAP_S, BACKOFF_BASE_S * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def is_rate_limited(status: int, headers: dict[str, str], message: str) -> bool:
+    if status == 429:
+        return True
+    return status == 403 and (headers.get("x-ratelimit-remaining") == "0" or "rate limit" in message.lower())
+
+
+def retry_delay(status: int, headers: dict[str, str], message: str, attempt: int, idempotent: bool) -> float | None:
+    if is_rate_limited(status, headers, message):
+        # A rate-limited request was never processed, so even a non-idempotent POST is safe to send again.
+        if headers.get("retry-after", "").isdigit():
+            return float(headers["retry-after"]) + random.uniform(0, 1)
+        if headers.get("x-ratelimit-remaining") == "0" and headers.get("x-ratelimit-reset", "").isdigit():
+            return max(0.0, float(headers["x-ratelimit-reset"]) - time.time()) + random.uniform(1, 2)
+        return SECONDARY_LIMIT_WAIT_S + backoff(attempt)
+    if idempotent and (status >= 500 or status == 0):
+        return backoff(attempt)
+    return None
+
+
+class GitHubClient:
+    def __init__(self, base_url: str | None = None, token: str | None = None):
+        url = urllib.parse.urlsplit((base_url or os.environ.get("CLAPTRAP_GH_API_URL") or DEFAULT_API_URL).rstrip("/"))
+        self.scheme, self.host, self.prefix = url.scheme, url.netloc, url.path
+        # GHE serves REST under /api/v3 but GraphQL at /api/graphql.
+        self.graphql_path = f"{self.prefix.removesuffix('/v3')}/graphql"
+        self.token = token or auth_token(url.hostname or self.host)
+        self.proxy = proxy_for(self.scheme, self.host)
+        self.idle: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(MAX_CONCURRENCY)
+        # One thread hitting a limit pauses every thread; GitHub counts the limit per token, not per connection.
+        self.pause_lock = threading.Lock()
+        self.paused_until = 0.0
+        self.stats = {"requests": 0, "retries": 0, "waited_s": 0.0}
+
+    def connect(self) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPConnection if self.scheme == "http" else http.client.HTTPSConnection
+        if self.proxy is None:
+            return connection_class(self.host, timeout=TIMEOUT_S)
+        # CONNECT through the proxy; TLS (for https) is then negotiated with GitHub inside the tunnel.
+        connection = connection_class(self.proxy.hostname, self.proxy.port or 80, timeout=TIMEOUT_S)
+        headers = {}
+        if self.proxy.username:
+            credentials = f"{urllib.parse.unquote(self.proxy.username)}:{urllib.parse.unquote(self.proxy.password or '')}"
+            headers["Proxy-Authorization"] = f"Basic {base64.b64encode(credentials.encode()).decode()}"
+        connection.set_tunnel(self.host, headers=headers)
+        return connection
+
+    def release(self, connection: http.client.HTTPConnection) -> None:
+        if self.idle.qsize() < POOL_SIZE:
+            self.idle.put(connection)
+        else:
+            connection.close()
+
+    def send(self, method: str, path: str, payload: bytes | None, idempotent: bool) -> tuple[int, dict[str, str], bytes]:
+        headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": API_VERSION,
+            "User-Agent": "claptrap-gh-scripts",
+        }
+        if payload is not None:
+            headers["Content-Type"] = "application/json"
+        try:
+            connection, reused = self.idle.get_nowait(), True
+        except queue.Empty:
+            connection, reused = self.connect(), False
+        sent = False
+        try:
+            connection.request(method, path, body=payload, headers=headers)
+            sent = True
+            response = connection.getresponse()
+            raw = response.read()
+        except (http.client.HTTPException, OSError) as error:
+            connection.close()
+            # An idle keep-alive socket the server already closed fails on write, or with no response byte at all; retry
+            # that once on a fresh connection. Once the request went out and something else failed, GitHub may have acted
+            # on it, so only a request that is safe to repeat is sent again. Failures on a fresh connection propagate.
+            unsent = isinstance(error, http.client.RemoteDisconnected) or (
+                not sent and isinstance(error, (BrokenPipeError, ConnectionResetError))
+            )
+            if not reused or not (idempotent or unsent):
+                raise
+            connection = self.connect()
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            raw = response.read()
+        if response.will_close:
+            connection.close()
+        else:
+            self.release(connection)
+        return response.status, {key.lower(): value for key, value in response.getheaders()}, raw
+
+    def pause(self, delay: float) -> None:
+        with self.pause_lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+            self.stats["retries"] += 1
+
+    def wait_if_paused(self) -> None:
+        delay = self.paused_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+            with self.pause_lock:
+                self.stats["waited_s"] += delay
+
+    def attempt(
+        self,
+        method: str,
+        path: str,
+        payload: bytes | None,
+        idempotent: bool,
+    ) -> tuple[int, dict[str, str], object, str]:
+        self.wait_if_paused()
+        with self.slots:
+            with self.pause_lock:
+                self.stats["requests"] += 1
+            try:
+                with claptrap_trace.span("http", method=method, graphql=path == self.graphql_path) as current:
+                    status, headers, raw = self.send(method, path, payload, idempotent)
+                    current.set(status=status)
+            except (http.client.HTTPException, OSError) as error:
+                return 0, {}, None, f"{method} {path} failed: {error}"
+        try:
+            with claptrap_trace.span("json.parse"):
+                data = json.loads(raw) if raw.strip() else None
+        except ValueError:
+            data = None  # proxies and 5xx pages answer with HTML
+        message = data.get("message", "") if isinstance(data, dict) else raw.decode("utf-8", "replace")
+        # GraphQL reports its own rate limit as a 200 with a RATE_LIMITED error.
+        errors = (data.get("errors") or []) if isinstance(data, dict) else []
+        if status == 200 and any(error.get("type") == "RATE_LIMITED" for error in errors):
+            status, message = 403, "GraphQL rate limit exceeded"
+        return status, headers, data, message
+
+    def request(self, method: str, path: str, body: object = None, idempotent: bool | None = None) -> object:
+        payload = None if body is None else json.dumps(body).encode("utf-8")
+        if idempotent is None:
+            idempotent = method != "POST"
+        for attempt in range(MAX_ATTEMPTS):
+            status, headers, data, message = self.attempt(method, path, payload, idempotent)
+            if 0 < status < 400:
+                return data
+            delay = retry_delay(status, headers, message, attempt, idempotent)
+            if delay is None or delay > MAX_WAIT_S or attempt == MAX_ATTEMPTS - 1:
+                break
+            self.pause(delay)
+        if status == 0:
+            raise GitHubError(0, message)
+        raise GitHubError(status, f"{method} {path}: {message}", headers)
+
+    def rest(self, method: str, path: str, body: object = None) -> object:
+        return self.request(method, f"{self.prefix}{path}", body)
+
+    def graphql(self, query: str, variables: dict[str, object]) -> dict:
+        body = {"query": query, "variables": variables}
+        response = self.request("POST", self.graphql_path, body, idempotent=not query.lstrip().startswith("mutation"))
+        if response.get("errors"):
+            raise GitHubError(200, f"GraphQL: {'; '.join(error.get('message', '') for error in response['errors'])}")
+        return response["data"]
+
+
+client_lock = threading.Lock()
+shared_client: GitHubClient | None = None
+
+
+def get_client() -> GitHubClient:
+    global shared_client
+    with client_lock:
+        if shared_client is None:
+            shared_client = GitHubClient()
+        return shared_client
@@ -2,80 +2,227 @@
 # /// script
 # dependencies = []
 # ///
-"""Replace a GitHub issue body and optionally add a timeline comment."""
+"""Replace GitHub issue bodies that differ from the desired text and optionally add a timeline comment."""
 
 from __future__ import annotations
 
 import argparse
-import os
-import subprocess
+import hashlib
+import json
+import re
 import sys
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import claptrap_trace
+import gh_cache
+import gh_client
+
+BODY_WORKERS = 4
+BODIES_PER_QUERY = 50  # aliases per GraphQL query; keeps each query well under GitHub's node limits
+
 
 def die(message: str) -> None:
     print(message, file=sys.stderr)
     raise SystemExit(1)
 
 
-def run(cmd: list[str], *, fail: bool = True) -> subprocess.CompletedProcess[str]:
-    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-    if fail and result.returncode != 0:
+def run(cmd: list[str]) -> str:
+    result = claptrap_trace.run(cmd, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
         stderr = result.stderr.strip() or result.stdout.strip()
         die(f"{' '.join(cmd)} failed: {stderr}")
-    return result
-
+    return result.stdout.strip()
 
-def write_temp_body(body: str) -> str:
-    with tempfile.NamedTemporaryFile("w", encoding="utf-8", delete=False) as temp:
-        temp.write(body)
-        return temp.name
 
-
-def body_path_from_args(args: argparse.Namespace) -> tuple[str, bool]:
+def api(method: str, path: str, body: object = None) -> object:
+    try:
+        return gh_client.get_client().rest(method, path, body)
+    except gh_client.GitHubError as error:
+        die(str(error))
+
+
+def detect_repo() -> tuple[str, str]:
+    workdir = str(Path.cwd().resolve())
+    # Reuse owner/repo only while the git config defining origin is unchanged, so a retargeted remote is re-read.
+    stamp = gh_cache.git_config_stamp(Path(workdir))
+    cached = gh_cache.get("remotes", workdir)
+    if stamp and cached and cached[2:] == [stamp]:
+        return cached[0], cached[1]
+    url = run(["git", "remote", "get-url", "origin"])
+    patterns = [
+        r"git@github\.com:([^/]+)/(.+?)(?:\.git)?",
+        r"https://(?:[^/@]+(?::[^/@]*)?@)?github\.com/([^/]+)/(.+?)(?:\.git)?",
+    ]
+    for pattern in patterns:
+        match = re.fullmatch(pattern, url)
+        if match:
+            gh_cache.put("remotes", workdir, [match.group(1), match.group(2), stamp], gh_cache.REMOTE_TTL_S)
+            return match.group(1), match.group(2)
+    die(f"cannot parse GitHub origin remote: {redact_url(url)}")
+
+
+def redact_url(url: str) -> str:
+    return re.sub(r"https://[^/@]+(?::[^/@]*)?@", "https://***@", url)
+
+
+def resolve_issue(value: str) -> tuple[str, str, int]:
+    text = value.strip().removeprefix("#")
+    if text.isdigit():
+        return *detect_repo(), int(text)
+    # An issue URL names its own repo, as `gh issue edit <url>` allowed.
+    match = re.fullmatch(r"https://github\.com/([^/]+)/([^/]+)/issues/(\d+)", text)
+    if not match:
+        die(f"cannot parse issue: {value}")
+    return match.group(1), match.group(2), int(match.group(3))
+
+
+def body_from_args(args: argparse.Namespace) -> str:
     if args.body_file:
         path = Path(args.body_file)
         if not path.exists():
             die(f"body file does not exist: {path}")
-        return str(path), False
-    return write_temp_body(args.body_text), True
-
-
-def replace_issue_body(issue: str, body_path: str) -> None:
-    run(["gh", "issue", "edit", issue, "--body-file", body_path])
+        with claptrap_trace.span("file.read"):
+            return path.read_text(encoding="utf-8")
+    return args.body_text
+
+
+def body_hash(body: str | None) -> str:
+    # Bodies edited in the web UI come back with CRLF line endings; those alone are not a change worth pushing.
+    text = (body or "").replace("\r\n", "\n")
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# Current bodies keyed by issue number; numbers that do not resolve to an issue are left out.
+def fetch_bodies(owner: str, repo: str, numbers: list[int]) -> dict[int, str]:
+    bodies = {}
+    client = gh_client.get_client()
+    for start in range(0, len(numbers), BODIES_PER_QUERY):
+        chunk = numbers[start:start + BODIES_PER_QUERY]
+        fields = " ".join(f"i{number}: issue(number: {number}) {{ body }}" for number in chunk)
+        query = f"query($owner: String!, $repo: String!) {{ repository(owner: $owner, name: $repo) {{ {fields} }} }}"
+        body = {"query": query, "variables": {"owner": owner, "repo": repo}}
+        try:
+            # Read data and errors separately: one missing issue answers NOT_FOUND alongside the bodies of the rest.
+            response = client.request("POST", client.graphql_path, body, idempotent=True)
+        except gh_client.GitHubError as error:
+            die(f"cannot fetch current bodies from {owner}/{repo}: {error}")
+        repository = (response.get("data") or {}).get("repository")
+        if repository is None:
+            die(f"cannot fetch current bodies from {owner}/{repo}: {response.get('errors')}")
+        bodies.update({number: repository[f"i{number}"]["body"] for number in chunk if repository.get(f"i{number}")})
+    return bodies
+
+
+def replace_issue_body(owner: str, repo: str, issue_number: int, body: str) -> None:
+    api("PATCH", f"/repos/{owner}/{repo}/issues/{issue_number}", {"body": body})
+
+
+def add_comment(owner: str, repo: str, issue_number: int, comment: str) -> None:
+    try:
+        gh_client.get_client().rest("POST", f"/repos/{owner}/{repo}/issues/{issue_number}/comments", {"body": comment})
+    except gh_client.GitHubError as error:
+        die(f"body updated, but adding the comment failed: {error}")
 
 
-def add_comment(issue: str, comment: str) -> None:
-    result = run(["gh", "issue", "comment", issue, "--body", comment], fail=False)
-    if result.returncode != 0:
-        stderr = result.stderr.strip() or result.stdout.strip()
-        die(f"body updated, but gh issue comment failed: {stderr}")
+def sync_body(owner: str, repo: str, issue_number: int, body: str, current: str | None, comment: str | None) -> dict:
+    result = {"issue": f"{owner}/{repo}#{issue_number}", "status": "unchanged"}
+    if current is not None and body_hash(current) == body_hash(body):
+        return result
+    try:
+        replace_issue_body(owner, repo, issue_number, body)
+    except SystemExit:
+        return {**result, "status": "failed"}
+    result["status"] = "updated"
+    if comment:
+        try:
+            add_comment(owner, repo, issue_number, comment)
+        except SystemExit:
+            result["comment"] = "failed"
+    return result
 
 
-def parse_args() -> argparse.Namespace:
+def load_manifest(path: str) -> list[dict]:
+    manifest_path = Path(path)
+    try:
+        with claptrap_trace.span("manifest.read"):
+            entries = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as error:
+        die(f"cannot read manifest {path}: {error}")
+    if not isinstance(entries, list):
+        die("manifest must be a JSON list of {issue, body_file | body, comment?} objects")
+    items = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or "issue" not in entry:
+            die(f"manifest entry {index} needs an issue")
+        if "body" in entry:
+            body = entry["body"]
+        elif "body_file" in entry:
+            body_path = manifest_path.parent / entry["body_file"]
+            if not body_path.exists():
+                die(f"body file does not exist: {body_path}")
+            body = body_path.read_text(encoding="utf-8")
+        else:
+            die(f"manifest entry {index} needs body or body_file")
+        owner, repo, number = resolve_issue(str(entry["issue"]))
+        items.append({"owner": owner, "repo": repo, "number": number, "body": body, "comment": entry.get("comment")})
+    return items
+
+
+def sync_bodies(items: list[dict], force: bool) -> list[dict]:
+    current: dict[tuple[str, str, int], str | None] = {}
+    if not force:
+        for owner, repo in {(item["owner"], item["repo"]) for item in items}:
+            numbers = sorted({item["number"] for item in items if (item["owner"], item["repo"]) == (owner, repo)})
+            current.update({(owner, repo, number): body for number, body in fetch_bodies(owner, repo, numbers).items()})
+
+    def sync(item: dict) -> dict:
+        key = (item["owner"], item["repo"], item["number"])
+        if not force and key not in current:
+            return {"issue": "{}/{}#{}".format(*key), "status": "failed", "error": "issue not found"}
+        return sync_body(*key, item["body"], current.get(key), item["comment"])
+
+    with ThreadPoolExecutor(max_workers=BODY_WORKERS) as pool:
+        return list(pool.map(sync, items))
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("--issue", required=True)
-    body_group = parser.add_mutually_exclusive_group(required=True)
+    parser.add_argument("--issue", help="issue number, #number, or issue URL")
+    body_group = parser.add_mutually_exclusive_group()
     body_group.add_argument("--body-file")
     body_group.add_argument("--body-text")
-    parser.add_argument("--comment", help="optional comment added after body edit succeeds")
-    return parser.parse_args()
-
-
-def main() -> None:
-    args = parse_args()
-    body_path, delete_body = body_path_from_args(args)
-    try:
-        replace_issue_body(args.issue, body_path)
-        if args.comment:
-            add_comment(args.issue, args.comment)
-    finally:
-        if delete_body:
-            try:
-                os.unlink(body_path)
-            except OSError:
-                pass
+    parser.add_argument("--comment", help="optional comment added after body edit succeeds (skipped when unchanged)")
+    parser.add_argument("--manifest", help="JSON list of {issue, body_file | body, comment?}; syncs every body in one pass")
+    parser.add_argument("--force", action="store_true", help="push bodies without comparing them to GitHub first")
+    args = parser.parse_args(argv)
+    if bool(args.manifest) == bool(args.issue):
+        parser.error("exactly one of --issue or --manifest is required")
+    if args.issue and not (args.body_file or args.body_text is not None):
+        parser.error("--issue requires --body-file or --body-text")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.manifest:
+        results = sync_bodies(load_manifest(args.manifest), args.force)
+        print(json.dumps(results, indent=2))
+        if any(result["status"] == "failed" or "comment" in result for result in results):
+            raise SystemExit(1)
+        return
+
+    body = body_from_args(args)
+    owner, repo, issue_number = resolve_issue(args.issue)
+    current = None if args.force else api("GET", f"/repos/{owner}/{repo}/issues/{issue_number}")["body"]
+    if current is not None and body_hash(current) == body_hash(body):
+        print(f"Unchanged: {owner}/{repo}#{issue_number}", file=sys.stderr)
+        print("status=unchanged")
+        return
+    replace_issue_body(owner, repo, issue_number, body)
+    if args.comment:
+        add_comment(owner, repo, issue_number, args.comment)
+    print("status=updated")
 
 
 if __name__ == "__main__":
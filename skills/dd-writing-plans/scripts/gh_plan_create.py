@@ -7,13 +7,18 @@
 from __future__ import annotations
 
 import argparse
-import os
+import json
 import re
-import subprocess
 import sys
-import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import claptrap_trace
+import gh_cache
+import gh_client
+
 
 def die(message: str) -> None:
     print(message, file=sys.stderr)
@@ -21,18 +26,34 @@ def die(message: str) -> None:
 
 
 def run(cmd: list[str]) -> str:
-    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    result = claptrap_trace.run(cmd, capture_output=True, text=True, check=False)
     if result.returncode != 0:
         stderr = result.stderr.strip() or result.stdout.strip()
         die(f"{' '.join(cmd)} failed: {stderr}")
     return result.stdout.strip()
 
 
-def gh(args: list[str]) -> str:
-    return run(["gh", *args])
+def api(method: str, path: str, body: object = None) -> object:
+    try:
+        return gh_client.get_client().rest(method, path, body)
+    except gh_client.GitHubError as error:
+        die(str(error))
+
+
+def graphql(query: str, variables: dict[str, object]) -> dict:
+    try:
+        return gh_client.get_client().graphql(query, variables)
+    except gh_client.GitHubError as error:
+        die(str(error))
 
 
 def detect_repo() -> tuple[str, str]:
+    workdir = str(Path.cwd().resolve())
+    # Reuse owner/repo only while the git config defining origin is unchanged, so a retargeted remote is re-read.
+    stamp = gh_cache.git_config_stamp(Path(workdir))
+    cached = gh_cache.get("remotes", workdir)
+    if stamp and cached and cached[2:] == [stamp]:
+        return cached[0], cached[1]
     url = run(["git", "remote", "get-url", "origin"])
     patterns = [
         r"git@github\.com:([^/]+)/(.+?)(?:\.git)?",
@@ -41,6 +62,7 @@ def detect_repo() -> tuple[str, str]:
     for pattern in patterns:
         match = re.fullmatch(pattern, url)
         if match:
+            gh_cache.put("remotes", workdir, [match.group(1), match.group(2), stamp], gh_cache.REMOTE_TTL_S)
             return match.group(1), match.group(2)
     die(f"cannot parse GitHub origin remote: {redact_url(url)}")
 
@@ -65,95 +87,96 @@ def parse_parent(value: str, owner: str, repo: str) -> int:
     return int(number)
 
 
-def parse_issue_number(output: str) -> int:
-    match = re.search(r"/issues/(\d+)\b", output) or re.search(r"#(\d+)\b", output)
-    if not match:
-        die(f"cannot parse issue number from gh issue create output: {output}")
-    return int(match.group(1))
-
+PLAN_LABEL_COLOR = "1d76db"
+PLAN_LABEL_DESC = "Implementation plan"
 
-def parse_issue_url(output: str) -> str:
-    match = re.search(r"https://github\.com/\S+/\S+/issues/\d+", output)
-    if not match:
-        die(f"cannot parse issue URL from gh issue create output: {output}")
-    return match.group(0)
 
+def ensure_plan_label(owner: str, repo: str, refresh: bool = False) -> None:
+    """Create or update the 'plan' label matching the gitdash format."""
+    wanted = {"color": PLAN_LABEL_COLOR, "description": PLAN_LABEL_DESC}
+    if not refresh and gh_cache.get(f"{owner}/{repo}", "label:plan") == wanted:
+        return
+    try:
+        gh_client.get_client().rest("POST", f"/repos/{owner}/{repo}/labels", {"name": "plan", **wanted})
+    except gh_client.GitHubError as error:
+        if error.status != 422:
+            die(str(error))
+        # Label already exists — edit it to match the desired format
+        api("PATCH", f"/repos/{owner}/{repo}/labels/plan", wanted)
+    gh_cache.put(f"{owner}/{repo}", "label:plan", wanted, gh_cache.LABEL_TTL_S)
 
-def issue_url_for(issue_number: int) -> str:
-    url = gh(["issue", "view", str(issue_number), "--json", "url", "--jq", ".url"])
-    if not url:
-        die(f"cannot determine URL for issue #{issue_number}")
-    return url
 
+def add_plan_label(owner: str, repo: str, issue_number: int) -> None:
+    path = f"/repos/{owner}/{repo}/issues/{issue_number}/labels"
+    try:
+        gh_client.get_client().rest("POST", path, {"labels": ["plan"]})
+        return
+    except gh_client.GitHubError:
+        pass
+    # The cached label may be stale (deleted since it was cached); recreate it once before giving up.
+    ensure_plan_label(owner, repo, refresh=True)
+    api("POST", path, {"labels": ["plan"]})
 
-PLAN_LABEL_COLOR = "1d76db"
-PLAN_LABEL_DESC = "Implementation plan"
 
+def get_issue(owner: str, repo: str, issue_number: int) -> dict:
+    issue = api("GET", f"/repos/{owner}/{repo}/issues/{issue_number}")
+    gh_cache.put(f"{owner}/{repo}", f"issue:{issue_number}", issue["id"], gh_cache.ISSUE_ID_TTL_S)
+    return issue
 
-def ensure_plan_label(owner: str, repo: str) -> None:
-    """Create or update the 'plan' label matching the gitdash format."""
-    result = subprocess.run(
-        ["gh", "label", "create", "plan",
-         "--color", PLAN_LABEL_COLOR,
-         "--description", PLAN_LABEL_DESC,
-         "--repo", f"{owner}/{repo}"],
-        capture_output=True, text=True,
-    )
-    if result.returncode != 0:
-        # Label likely already exists — edit it to match the desired format
-        subprocess.run(
-            ["gh", "label", "edit", "plan",
-             "--color", PLAN_LABEL_COLOR,
-             "--description", PLAN_LABEL_DESC,
-             "--repo", f"{owner}/{repo}"],
-            capture_output=True, text=True, check=True,
-        )
 
+def get_issue_database_id(owner: str, repo: str, issue_number: int) -> int:
+    cached = gh_cache.get(f"{owner}/{repo}", f"issue:{issue_number}")
+    if cached:
+        return cached
+    return get_issue(owner, repo, issue_number)["id"]
 
-def ensure_parent_issue_exists(parent_number: int) -> None:
-    gh(["issue", "view", str(parent_number), "--json", "number", "--jq", ".number"])
 
+def ensure_parent_issue_exists(owner: str, repo: str, parent_number: int) -> None:
+    # A cached database id means the parent existed recently; a deleted parent still fails loudly at link time.
+    get_issue_database_id(owner, repo, parent_number)
 
-def get_issue_database_id(owner: str, repo: str, issue_number: int) -> str:
-    database_id = gh(["api", f"/repos/{owner}/{repo}/issues/{issue_number}", "--jq", ".id"])
-    if not database_id:
-        die(f"cannot determine REST database id for issue #{issue_number}")
-    return database_id
 
+SUB_ISSUE_PAGE_SIZE = 100
 
-def is_sub_issue(owner: str, repo: str, parent_number: int, issue_number: int) -> bool:
-    result = subprocess.run(
-        ["gh", "api", f"/repos/{owner}/{repo}/issues/{parent_number}/sub_issues", "--jq", ".[ ].number".replace(" ", "")],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    if result.returncode != 0:
-        return False
-    return str(issue_number) in result.stdout.splitlines()
+# parent number -> sub-issue numbers seen so far and the next page to fetch (None once the list is exhausted).
+# Lives for the whole process, so linking many plans under one spec fetches each page at most once.
+sub_issue_index: dict[int, dict] = {}
 
 
-def ensure_sub_issue(owner: str, repo: str, parent_number: int, issue_number: int, sub_issue_id: str) -> None:
-    if is_sub_issue(owner, repo, parent_number, issue_number):
-        return
-    result = subprocess.run(
-        [
-            "gh",
-            "api",
-            "--method",
-            "POST",
-            f"/repos/{owner}/{repo}/issues/{parent_number}/sub_issues",
-            "-F",
-            f"sub_issue_id={sub_issue_id}",
-        ],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    if result.returncode == 0 or is_sub_issue(owner, repo, parent_number, issue_number):
+def is_sub_issue(owner: str, repo: str, parent_number: int, issue_number: int) -> bool:
+    entry = sub_issue_index.setdefault(parent_number, {"numbers": set(), "next_page": 1})
+    while issue_number not in entry["numbers"] and entry["next_page"] is not None:
+        page = entry["next_page"]
+        path = f"/repos/{owner}/{repo}/issues/{parent_number}/sub_issues?per_page={SUB_ISSUE_PAGE_SIZE}&page={page}"
+        try:
+            issues = gh_client.get_client().rest("GET", path)
+        except gh_client.GitHubError:
+            return False
+        entry["numbers"].update(issue["number"] for issue in issues)
+        entry["next_page"] = page + 1 if len(issues) == SUB_ISSUE_PAGE_SIZE else None
+    return issue_number in entry["numbers"]
+
+
+def ensure_sub_issue(
+    owner: str,
+    repo: str,
+    parent_number: int,
+    issue_number: int,
+    sub_issue_id: int,
+    check_existing: bool = True,
+) -> None:
+    if check_existing and is_sub_issue(owner, repo, parent_number, issue_number):
         return
-    stderr = result.stderr.strip() or result.stdout.strip()
-    die(f"sub-issue link failed: {stderr}")
+    path = f"/repos/{owner}/{repo}/issues/{parent_number}/sub_issues"
+    try:
+        gh_client.get_client().rest("POST", path, {"sub_issue_id": sub_issue_id})
+    except gh_client.GitHubError as error:
+        # The POST can fail because someone else linked it meanwhile; only then is the cached list worth refetching.
+        sub_issue_index.pop(parent_number, None)
+        if is_sub_issue(owner, repo, parent_number, issue_number):
+            return
+        die(f"sub-issue link failed: {error}")
+    sub_issue_index.setdefault(parent_number, {"numbers": set(), "next_page": 1})["numbers"].add(issue_number)
 
 
 def create_plan(title: str | None, body: str | None, parent: str, existing_issue: int | None) -> tuple[int, str]:
@@ -162,66 +185,416 @@ def create_plan(title: str | None, body: str | None, parent: str, existing_issue
     print(f"Repo: {owner}/{repo}", file=sys.stderr)
     print(f"Parent spec: #{parent_number}", file=sys.stderr)
     ensure_plan_label(owner, repo)
-    ensure_parent_issue_exists(parent_number)
+    ensure_parent_issue_exists(owner, repo, parent_number)
 
     if existing_issue is not None:
-        issue_number = existing_issue
-        issue_url = issue_url_for(issue_number)
-        print(f"Resuming: {issue_url}", file=sys.stderr)
+        issue = get_issue(owner, repo, existing_issue)
+        print(f"Resuming: {issue['html_url']}", file=sys.stderr)
     else:
         if title is None or body is None:
             die("--title and --body-file/--body-text are required unless --issue is provided")
-        if not Path(body).exists():
-            die(f"body file does not exist: {body}")
-        created = gh(["issue", "create", "--title", title, "--body-file", body])
-        issue_number = parse_issue_number(created)
-        issue_url = parse_issue_url(created)
-        print(f"Created: {issue_url}", file=sys.stderr)
+        # Creating with the label saves the separate label call; the response also carries the database id.
+        issue = api("POST", f"/repos/{owner}/{repo}/issues", {"title": title, "body": body, "labels": ["plan"]})
+        gh_cache.put(f"{owner}/{repo}", f"issue:{issue['number']}", issue["id"], gh_cache.ISSUE_ID_TTL_S)
+        print(f"Created: {issue['html_url']}", file=sys.stderr)
 
+    issue_number = issue["number"]
     try:
-        gh(["issue", "edit", str(issue_number), "--add-label", "plan"])
-        sub_issue_id = get_issue_database_id(owner, repo, issue_number)
-        ensure_sub_issue(owner, repo, parent_number, issue_number, sub_issue_id)
+        if "plan" not in {label["name"] for label in issue["labels"]}:
+            add_plan_label(owner, repo, issue_number)
+        # A just-created issue cannot be linked yet, so skip paging through the parent's sub-issues.
+        ensure_sub_issue(owner, repo, parent_number, issue_number, issue["id"], check_existing=existing_issue is not None)
     except SystemExit:
         print(f"Recovery: retry with --issue {issue_number} --parent {parent_number} to finish labeling/linkage without creating a duplicate.", file=sys.stderr)
         raise
-    return issue_number, issue_url
+    return issue_number, issue["html_url"]
+
+
+RESOLVE_QUERY = """
+query($owner: String!, $repo: String!, $parent: Int!, $issue: Int!, $resume: Boolean!) {
+  repository(owner: $owner, name: $repo) {
+    id
+    label(name: "plan") { id color description }
+    parent: issue(number: $parent) { id }
+    plan: issue(number: $issue) @include(if: $resume) {
+      id
+      url
+      labels(first: 100) { nodes { name } }
+      parent { number }
+    }
+  }
+}
+"""
+
+CREATE_LABEL_MUTATION = """
+mutation($repo: ID!, $color: String!, $description: String!) {
+  createLabel(input: {repositoryId: $repo, name: "plan", color: $color, description: $description}) { label { id } }
+}
+"""
+
+UPDATE_LABEL_MUTATION = """
+mutation($label: ID!, $color: String!, $description: String!) {
+  updateLabel(input: {id: $label, color: $color, description: $description}) { label { id } }
+}
+"""
+
+# createIssue applies the label and the parent link atomically, so a failure never leaves a half-configured plan.
+# Bulk mode passes a null parent and links afterwards, in manifest order.
+CREATE_PLAN_MUTATION = """
+mutation($repo: ID!, $title: String!, $body: String!, $label: ID!, $parent: ID) {
+  createIssue(input: {repositoryId: $repo, title: $title, body: $body, labelIds: [$label], parentIssueId: $parent}) {
+    issue { id number url }
+  }
+}
+"""
+
+ADD_LABEL_FIELD = "addLabelsToLabelable(input: {labelableId: $issue, labelIds: [$label]}) { clientMutationId }"
+ADD_SUB_ISSUE_FIELD = "addSubIssue(input: {issueId: $parent, subIssueId: $issue}) { clientMutationId }"
+
+
+def resolve_plan_context(owner: str, repo: str, parent_number: int, existing_issue: int | None) -> dict:
+    variables = {
+        "owner": owner,
+        "repo": repo,
+        "parent": parent_number,
+        "issue": existing_issue or 0,
+        "resume": existing_issue is not None,
+    }
+    repository = graphql(RESOLVE_QUERY, variables)["repository"]
+    if repository is None:
+        die(f"cannot resolve repository {owner}/{repo}")
+    if repository["parent"] is None:
+        die(f"parent issue #{parent_number} not found in {owner}/{repo}")
+    return repository
+
+
+def ensure_plan_label_id(repository: dict) -> str:
+    label = repository["label"]
+    colors = {"color": PLAN_LABEL_COLOR, "description": PLAN_LABEL_DESC}
+    if label is None:
+        return graphql(CREATE_LABEL_MUTATION, {"repo": repository["id"], **colors})["createLabel"]["label"]["id"]
+    if (label["color"].lower(), label["description"]) != (PLAN_LABEL_COLOR, PLAN_LABEL_DESC):
+        graphql(UPDATE_LABEL_MUTATION, {"label": label["id"], **colors})
+    return label["id"]
+
+
+# Resume path: label and link whatever is still missing, in a single mutation document.
+def finish_plan_graphql(plan: dict, label_id: str, parent_id: str, parent_number: int) -> None:
+    linked_parent = (plan["parent"] or {}).get("number")
+    if linked_parent not in (None, parent_number):
+        die(f"issue is already a sub-issue of #{linked_parent}, not #{parent_number}")
+
+    params, fields, variables = ["$issue: ID!"], [], {"issue": plan["id"]}
+    if "plan" not in {label["name"] for label in plan["labels"]["nodes"]}:
+        params.append("$label: ID!")
+        fields.append(ADD_LABEL_FIELD)
+        variables["label"] = label_id
+    if linked_parent is None:
+        params.append("$parent: ID!")
+        fields.append(ADD_SUB_ISSUE_FIELD)
+        variables["parent"] = parent_id
+    if not fields: return
+    graphql(f"mutation({', '.join(params)}) {{ {' '.join(fields)} }}", variables)
+
+
+def create_plan_graphql(title: str | None, body: str | None, parent: str, existing_issue: int | None) -> tuple[int, str]:
+    owner, repo = detect_repo()
+    parent_number = parse_parent(parent, owner, repo)
+    print(f"Repo: {owner}/{repo}", file=sys.stderr)
+    print(f"Parent spec: #{parent_number}", file=sys.stderr)
+    repository = resolve_plan_context(owner, repo, parent_number, existing_issue)
+    label_id = ensure_plan_label_id(repository)
+
+    if existing_issue is not None:
+        plan = repository["plan"]
+        if plan is None: die(f"issue #{existing_issue} not found in {owner}/{repo}")
+        print(f"Resuming: {plan['url']}", file=sys.stderr)
+        try:
+            finish_plan_graphql(plan, label_id, repository["parent"]["id"], parent_number)
+        except SystemExit:
+            recovery = f"retry with --issue {existing_issue} --parent {parent_number}"
+            print(f"Recovery: {recovery} to finish labeling/linkage without creating a duplicate.", file=sys.stderr)
+            raise
+        return existing_issue, plan["url"]
+
+    if title is None or body is None:
+        die("--title and --body-file/--body-text are required unless --issue is provided")
+    variables = {
+        "repo": repository["id"],
+        "title": title,
+        "body": body,
+        "label": label_id,
+        "parent": repository["parent"]["id"],
+    }
+    issue = graphql(CREATE_PLAN_MUTATION, variables)["createIssue"]["issue"]
+    print(f"Created: {issue['url']}", file=sys.stderr)
+    return issue["number"], issue["url"]
+
+
+BULK_WORKERS = 3
+CREATE_INTERVAL_S = 1.0  # GitHub's secondary limits ask for >= 1s between content-creating requests
+
+BULK_RESOLVE_QUERY = """
+query($owner: String!, $repo: String!, $parent: Int!) {
+  repository(owner: $owner, name: $repo) {
+    id
+    label(name: "plan") { id color description }
+    parent: issue(number: $parent) {
+      id
+      subIssues(first: 100) {
+        nodes { id number title url }
+        pageInfo { hasNextPage endCursor }
+      }
+    }
+    plans: issues(labels: ["plan"], states: OPEN, first: 100, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { id number title url body parent { number } }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+PLANS_PAGE_QUERY = """
+query($owner: String!, $repo: String!, $after: String) {
+  repository(owner: $owner, name: $repo) {
+    plans: issues(labels: ["plan"], states: OPEN, first: 100, after: $after, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { id number title url body parent { number } }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+# Bulk-created plans carry their intended parent until linked, so a rerun adopts only its own unlinked leftovers.
+# unmark_bulk_issues removes it once the link exists.
+PARENT_MARKER = "<!-- claptrap-parent: #{parent} -->"
+
+SUB_ISSUES_PAGE_QUERY = """
+query($parent: ID!, $after: String) {
+  node(id: $parent) {
+    ... on Issue {
+      subIssues(first: 100, after: $after) {
+        nodes { id number title url }
+        pageInfo { hasNextPage endCursor }
+      }
+    }
+  }
+}
+"""
+
+create_gate = threading.Lock()
+next_create_at = 0.0
+
+
+def wait_for_create_slot() -> None:
+    global next_create_at
+    with create_gate:
+        delay = next_create_at - time.monotonic()
+        if delay > 0: time.sleep(delay)
+        next_create_at = time.monotonic() + CREATE_INTERVAL_S
+
+
+def load_manifest(path: str) -> list[dict]:
+    manifest_path = Path(path)
+    try:
+        with claptrap_trace.span("manifest.read"):
+            entries = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as error:
+        die(f"cannot read manifest {path}: {error}")
+    if not isinstance(entries, list) or not entries:
+        die("manifest must be a non-empty JSON list of {title, body_file | body} objects")
+
+    plans = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not isinstance(entry.get("title"), str):
+            die(f"manifest entry {index} needs a string title")
+        if "body" in entry:
+            body = entry["body"]
+        elif "body_file" in entry:
+            # Relative body files resolve against the manifest, so a plan directory can be moved as a unit.
+            body_path = manifest_path.parent / entry["body_file"]
+            if not body_path.exists(): die(f"body file does not exist: {body_path}")
+            body = body_path.read_text(encoding="utf-8")
+        else:
+            die(f"manifest entry {index} needs body or body_file")
+        plans.append({"index": index, "title": entry["title"], "body": body})
+
+    titles = [plan["title"] for plan in plans]
+    duplicates = sorted({title for title in titles if titles.count(title) > 1})
+    if duplicates: die(f"manifest titles must be unique (they identify plans on rerun): {', '.join(duplicates)}")
+    return plans
+
+
+def all_sub_issues(parent: dict) -> list[dict]:
+    connection = parent["subIssues"]
+    nodes = list(connection["nodes"])
+    while connection["pageInfo"]["hasNextPage"]:
+        variables = {"parent": parent["id"], "after": connection["pageInfo"]["endCursor"]}
+        connection = graphql(SUB_ISSUES_PAGE_QUERY, variables)["node"]["subIssues"]
+        nodes += connection["nodes"]
+    return nodes
+
+
+def find_orphans(owner: str, repo: str, plans: dict, parent_number: int, titles: set[str]) -> dict[str, dict]:
+    marker = PARENT_MARKER.format(parent=parent_number)
+    orphans, connection = {}, plans
+    while True:
+        for issue in connection["nodes"]:
+            if issue["parent"] is None and issue["title"] in titles and marker in (issue["body"] or ""):
+                orphans.setdefault(issue["title"], issue)  # newest first, as ordered
+        if titles <= orphans.keys() or not connection["pageInfo"]["hasNextPage"]:
+            return orphans
+        variables = {"owner": owner, "repo": repo, "after": connection["pageInfo"]["endCursor"]}
+        connection = graphql(PLANS_PAGE_QUERY, variables)["repository"]["plans"]
+
+
+def create_bulk_issue(plan: dict, repository_id: str, label_id: str, parent_number: int) -> dict:
+    wait_for_create_slot()
+    body = f"{plan['body'].rstrip()}\n\n{PARENT_MARKER.format(parent=parent_number)}\n"
+    variables = {"repo": repository_id, "title": plan["title"], "body": body, "label": label_id, "parent": None}
+    try:
+        issue = graphql(CREATE_PLAN_MUTATION, variables)["createIssue"]["issue"]
+    except SystemExit:
+        return {**plan, "status": "failed"}
+    print(f"Created: {issue['url']}", file=sys.stderr)
+    created = {"id": issue["id"], "issue_number": issue["number"], "issue_url": issue["url"], "marked_body": body}
+    return {**plan, "status": "created", **created}
+
+
+# One mutation document; top-level mutation fields run serially, so sub-issue order follows the manifest.
+# Plans whose own alias did not link are marked unlinked; the rest of the batch still counts as linked.
+def link_bulk_issues(plans: list[dict], parent_id: str) -> None:
+    if not plans: return
+    params, fields, variables = ["$parent: ID!"], [], {"parent": parent_id}
+    for position, plan in enumerate(plans):
+        params.append(f"$issue{position}: ID!")
+        link = f"addSubIssue(input: {{issueId: $parent, subIssueId: $issue{position}}}) {{ clientMutationId }}"
+        fields.append(f"link{position}: {link}")
+        variables[f"issue{position}"] = plan["id"]
+    client = gh_client.get_client()
+    query = f"mutation({', '.join(params)}) {{ {' '.join(fields)} }}"
+    try:
+        # Read data and errors separately: one failed link answers with its error alongside the links that succeeded.
+        response = client.request("POST", client.graphql_path, {"query": query, "variables": variables}, idempotent=False)
+    except gh_client.GitHubError as error:
+        print(f"sub-issue links failed: {error}", file=sys.stderr)
+        response = {}
+    for error in response.get("errors") or []:
+        print(f"sub-issue link failed: {error.get('message', '')}", file=sys.stderr)
+    data = response.get("data") or {}
+    for position, plan in enumerate(plans):
+        if not data.get(f"link{position}"): plan["status"] = "unlinked"
+
+
+# One mutation stripping the parent marker from every plan that is now linked; unlinked plans keep it for a rerun.
+# A plan whose marker stays is still found through the parent's sub-issues, so a failure here only warns.
+def unmark_bulk_issues(plans: list[dict], parent_number: int) -> None:
+    marker = re.compile(rf"(?:\r?\n)*{re.escape(PARENT_MARKER.format(parent=parent_number))}")
+    plans = [plan for plan in plans if plan["status"] in ("created", "resumed") and marker.search(plan["marked_body"])]
+    if not plans: return
+    params, fields, variables = [], [], {}
+    for position, plan in enumerate(plans):
+        params += [f"$issue{position}: ID!", f"$body{position}: String!"]
+        update = f"updateIssue(input: {{id: $issue{position}, body: $body{position}}}) {{ clientMutationId }}"
+        fields.append(f"unmark{position}: {update}")
+        variables[f"issue{position}"] = plan["id"]
+        variables[f"body{position}"] = marker.sub("", plan["marked_body"])
+    client = gh_client.get_client()
+    query = f"mutation({', '.join(params)}) {{ {' '.join(fields)} }}"
+    try:
+        # Setting a body to a fixed value is safe to repeat, so a dropped connection may retry this one.
+        response = client.request("POST", client.graphql_path, {"query": query, "variables": variables}, idempotent=True)
+    except gh_client.GitHubError as error:
+        response = {"errors": [{"message": str(error)}]}
+    for error in response.get("errors") or []:
+        print(f"could not remove the parent marker: {error.get('message', '')}", file=sys.stderr)
 
 
-def body_file_from_args(args: argparse.Namespace) -> tuple[str | None, bool]:
+def create_plans_bulk(manifest: str, parent: str) -> dict:
+    plans = load_manifest(manifest)
+    owner, repo = detect_repo()
+    parent_number = parse_parent(parent, owner, repo)
+    print(f"Repo: {owner}/{repo}", file=sys.stderr)
+    print(f"Parent spec: #{parent_number}", file=sys.stderr)
+    repository = graphql(BULK_RESOLVE_QUERY, {"owner": owner, "repo": repo, "parent": parent_number})["repository"]
+    if repository is None: die(f"cannot resolve repository {owner}/{repo}")
+    if repository["parent"] is None: die(f"parent issue #{parent_number} not found in {owner}/{repo}")
+    label_id = ensure_plan_label_id(repository)
+
+    # Titles are the rerun key: linked plans are done, and open unlinked plans marked for this parent are leftovers of
+    # an interrupted run.
+    linked = {issue["title"]: issue for issue in all_sub_issues(repository["parent"])}
+    unmatched = {plan["title"] for plan in plans} - linked.keys()
+    orphans = find_orphans(owner, repo, repository["plans"], parent_number, unmatched) if unmatched else {}
+    results, pending = [], []
+    for plan in plans:
+        known = linked.get(plan["title"]) or orphans.get(plan["title"])
+        if known is None:
+            pending.append(plan)
+            continue
+        status = "existing" if plan["title"] in linked else "resumed"
+        issue = {"id": known["id"], "issue_number": known["number"], "issue_url": known["url"]}
+        results.append({**plan, "status": status, **issue, "marked_body": known.get("body") or ""})
+
+    with ThreadPoolExecutor(max_workers=BULK_WORKERS) as pool:
+        results += pool.map(lambda plan: create_bulk_issue(plan, repository["id"], label_id, parent_number), pending)
+    results.sort(key=lambda result: result["index"])
+
+    to_link = [result for result in results if result["status"] in ("created", "resumed")]
+    link_bulk_issues(to_link, repository["parent"]["id"])
+    unmark_bulk_issues(to_link, parent_number)
+
+    summary = [
+        {key: result[key] for key in ("title", "status", "issue_number", "issue_url") if key in result}
+        for result in results
+    ]
+    return {"parent": parent_number, "plans": summary}
+
+
+def body_from_args(args: argparse.Namespace) -> str | None:
     if args.body_file:
-        return args.body_file, False
-    if args.body_text is None:
-        return None, False
-    with tempfile.NamedTemporaryFile("w", encoding="utf-8", delete=False) as temp:
-        temp.write(args.body_text)
-        return temp.name, True
+        if not Path(args.body_file).exists():
+            die(f"body file does not exist: {args.body_file}")
+        with claptrap_trace.span("file.read"):
+            return Path(args.body_file).read_text(encoding="utf-8")
+    return args.body_text
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--title")
     parser.add_argument("--parent", required=True, help="parent spec issue number, #number, or issue URL")
     parser.add_argument("--issue", type=int, help="existing plan issue number to resume after partial failure")
+    parser.add_argument(
+        "--graphql",
+        action="store_true",
+        help="resolve, create, label and link in one query and one mutation",
+    )
+    parser.add_argument(
+        "--manifest",
+        help="JSON list of {title, body_file | body}; creates and links every plan (uses GraphQL)",
+    )
     body_group = parser.add_mutually_exclusive_group()
     body_group.add_argument("--body-file")
     body_group.add_argument("--body-text")
-    return parser.parse_args()
-
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.manifest:
+        if args.title or args.issue or args.body_file or args.body_text is not None:
+            die("--manifest cannot be combined with --title, --issue, --body-file or --body-text")
+        result = create_plans_bulk(args.manifest, args.parent)
+        print(json.dumps(result, indent=2))
+        if any(plan["status"] in ("failed", "unlinked") for plan in result["plans"]):
+            die(f"Recovery: rerun with the same --manifest and --parent {result['parent']}; finished plans are skipped.")
+        return
 
-def main() -> None:
-    args = parse_args()
-    body_file, delete_body = body_file_from_args(args)
-    try:
-        issue_number, issue_url = create_plan(args.title, body_file, args.parent, args.issue)
-        print(f"issue_number={issue_number}")
-        print(f"issue_url={issue_url}")
-    finally:
-        if delete_body:
-            try:
-                os.unlink(body_file)
-            except OSError:
-                pass
+    create = create_plan_graphql if args.graphql else create_plan
+    issue_number, issue_url = create(args.title, body_from_args(args), args.parent, args.issue)
+    print(f"issue_number={issue_number}")
+    print(f"issue_url={issue_url}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,188 @@
+"""Shared notebook model for the nb_* scripts: load, save and lazy per-cell views."""
+
+# load() keeps each cell's type, execution count, source and output count plus its span in the file text; outputs,
+# metadata and attachments are decoded from that span only when a command asks for them (--outputs, nb_edit).
+
+import json
+import re
+
+import claptrap_trace
+
+ANSI_RE = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]")
+TEXT_MIMES = ("text/plain", "text/markdown", "text/html")
+WS_RE = re.compile(r"[ \t\n\r]*")
+
+
+def join_source(src):
+    return "".join(src) if isinstance(src, list) else src
+
+
+def split_source(text):
+    return text.splitlines(True)
+
+
+# The searchable text of one output: stream text, a de-ANSI'd traceback, or the first text MIME type.
+def output_text(output):
+    otype = output.get("output_type", "")
+    if otype == "stream":
+        return join_source(output.get("text", ""))
+    if otype == "error":
+        return ANSI_RE.sub("", "\n".join(output.get("traceback", [])))
+    if otype in ("execute_result", "display_data"):
+        data = output.get("data", {})
+        for mime in TEXT_MIMES:
+            if mime in data:
+                return join_source(data[mime])
+    return ""
+
+
+class Cell:
+    __slots__ = (
+        "cell_type", "execution_count", "output_count",
+        "_doc", "_span", "_src", "_raw", "_source", "_lines", "_output_texts",
+    )
+
+    def __init__(self, cell, doc=None, span=None):
+        self.cell_type = cell.get("cell_type", "?")
+        self.execution_count = cell.get("execution_count")
+        self.output_count = len(cell.get("outputs", []))
+        self._src = cell.get("source", "")
+        # With a span the full cell is re-decoded from the file text on demand; without one, cell is the full cell.
+        self._doc, self._span = doc, span
+        self._raw = None if span else cell
+        self._source = self._lines = self._output_texts = None
+
+    # The complete cell dict, decoded on first access. Mutate it through set_source or directly before save.
+    @property
+    def raw(self):
+        if self._raw is None:
+            start, end = self._span
+            self._raw = json.loads(self._doc[start:end])
+            self._doc = self._span = None
+        return self._raw
+
+    @property
+    def source(self):
+        if self._source is None:
+            self._source = join_source(self._src)
+        return self._source
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            self._lines = self.source.splitlines()
+        return self._lines
+
+    @property
+    def outputs(self):
+        return self.raw.get("outputs", []) if self.output_count else []
+
+    @property
+    def output_texts(self):
+        if self._output_texts is None:
+            self._output_texts = [output_text(output) for output in self.outputs]
+        return self._output_texts
+
+    def set_source(self, text):
+        self.raw["source"] = self._src = split_source(text)
+        self._source = self._lines = None
+
+    def clear_outputs(self):
+        self.raw["outputs"] = []
+        self.raw["execution_count"] = self.execution_count = None
+        self.output_count = 0
+        self._output_texts = None
+
+
+class Notebook:
+    __slots__ = ("fields", "cells")
+
+    def __init__(self, fields, cells):
+        self.fields, self.cells = fields, cells  # fields keeps the top-level key order, "cells" included
+
+    def get(self, key, default=None):
+        return self.fields.get(key, default)
+
+    def to_json(self):
+        doc = {key: [cell.raw for cell in self.cells] if key == "cells" else value for key, value in self.fields.items()}
+        return json.dumps(doc, indent=1, ensure_ascii=False) + "\n"
+
+
+def skip_ws(text, pos):
+    return WS_RE.match(text, pos).end()
+
+
+# Top-level fields plus one view per cell, decoding each cell once and dropping what the view doesn't keep.
+def scan(text):
+    decode = json.JSONDecoder().raw_decode
+    fields, cells = {}, []
+    pos = skip_ws(text, 0)
+    if text[pos] != "{":
+        raise ValueError("notebook is not a JSON object")
+    pos = skip_ws(text, pos + 1)
+    while text[pos] != "}":
+        key, pos = decode(text, pos)
+        pos = skip_ws(text, pos)
+        if not isinstance(key, str) or text[pos] != ":":
+            raise ValueError("malformed object key")
+        pos = skip_ws(text, pos + 1)
+        if key == "cells":
+            fields[key], cells, pos = None, [], expect(text, pos, "[")
+            while text[pos] != "]":
+                cell, end = decode(text, pos)
+                if not isinstance(cell, dict):
+                    raise ValueError("cell is not an object")
+                cells.append(Cell(cell, text, (pos, end)))
+                pos = after_member(text, end, "]")
+            pos += 1
+        else:
+            fields[key], pos = decode(text, pos)
+        pos = after_member(text, pos, "}")
+    if skip_ws(text, pos + 1) != len(text):
+        raise ValueError("extra data after the notebook")
+    return Notebook(fields, cells)
+
+
+def expect(text, pos, char):
+    if text[pos] != char:
+        raise ValueError(f"expected {char!r} at {pos}")
+    return skip_ws(text, pos + 1)
+
+
+# Position of the next member, or of the closing bracket; a trailing comma is an error, as in json.loads.
+def after_member(text, pos, close):
+    pos = skip_ws(text, pos)
+    if text[pos] == close:
+        return pos
+    pos = expect(text, pos, ",")
+    if text[pos] == close:
+        raise ValueError("trailing comma")
+    return pos
+
+
+def parse(text):
+    with claptrap_trace.span("json.parse"):
+        try:
+            return scan(text)
+        except (ValueError, IndexError):
+            # Anything the streaming walk doesn't expect: let json.loads decide, and report its error if it fails too.
+            fields = json.loads(text)
+            return Notebook(fields, [Cell(cell) for cell in fields.get("cells", [])])
+
+
+def load(path):
+    with claptrap_trace.span("file.read"), open(path) as f:
+        text = f.read()
+    return parse(text)
+
+
+# (line number, line) for each line of text the regex matches; nb_search.py's matching rule.
+def matching_lines(regex, text):
+    return [(line_no, line.rstrip()) for line_no, line in enumerate(text.splitlines(), 1) if regex.search(line)]
+
+
+def save(nb, path):
+    with claptrap_trace.span("render"):
+        text = nb.to_json()
+    with claptrap_trace.span("write"), open(path, "w") as f:
+        f.write(text)
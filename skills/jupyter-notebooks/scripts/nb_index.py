@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""Trigram index over a notebook corpus, so a regex search reads a few cells instead of every notebook."""
+
+# One SQLite file ($CLAPTRAP_NB_INDEX, default ~/.cache/claptrap/nb-index.sqlite) holds each cell's source, optionally
+# its output text, and a trigram -> cell posting table. Only cells holding every trigram the regex requires are matched.
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import time
+
+import claptrap_trace
+import nb_core
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+INDEX_ENV = "CLAPTRAP_NB_INDEX"
+DEFAULT_INDEX = os.path.expanduser("~/.cache/claptrap/nb-index.sqlite")
+SCHEMA_VERSION = "2"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS notebooks (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, mtime_ns INTEGER, size INTEGER, sha1 TEXT, outputs INTEGER
+);
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY, notebook INTEGER NOT NULL, cell INTEGER, output INTEGER, cell_type TEXT, text TEXT
+);
+CREATE INDEX IF NOT EXISTS docs_notebook ON docs (notebook);
+CREATE TABLE IF NOT EXISTS postings (tri TEXT, doc INTEGER, PRIMARY KEY (tri, doc)) WITHOUT ROWID;
+"""
+# Under re.IGNORECASE these two match "i", but casefold() would turn U+0130 into two characters.
+FOLD = {0x130: "i", 0x131: "i"}
+COMMIT_INTERVAL_S = 1.0
+MAX_ALTERNATIVES = 16
+MAX_TRIGRAMS = 48  # per alternative; any subset of the required trigrams is still a valid filter
+REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, "POSSESSIVE_REPEAT", None)}
+ANYTHING = frozenset([frozenset()])  # one alternative that requires nothing
+
+
+###################################################################################################
+# Index
+###################################################################################################
+def connect(path=None):
+    path = path or os.environ.get(INDEX_ENV) or DEFAULT_INDEX
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    db = sqlite3.connect(path, timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")  # searches keep reading while another process updates
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute("PRAGMA cache_size=-65536")  # 64 MB: posting inserts land all over the (tri, doc) B-tree
+    version = None
+    if db.execute("SELECT 1 FROM sqlite_master WHERE name = 'meta'").fetchone():
+        version = (db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone() or [None])[0]
+    if version not in (None, SCHEMA_VERSION):
+        with db:
+            db.executescript(
+                "DROP TABLE IF EXISTS meta; DROP TABLE IF EXISTS notebooks; "
+                "DROP TABLE IF EXISTS docs; DROP TABLE IF EXISTS postings;"
+            )
+    with db:
+        db.executescript(SCHEMA)
+        db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (SCHEMA_VERSION,))
+    return db
+
+
+def normalize(text):
+    return text.translate(FOLD).casefold()
+
+
+def trigrams(text):
+    text = normalize(text)
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def find_notebooks(roots):
+    for root in roots:
+        if os.path.isfile(root):
+            yield os.path.abspath(root)
+            continue
+        for directory, dirs, files in os.walk(os.path.abspath(root)):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]  # .ipynb_checkpoints, .git
+            for name in files:
+                if name.endswith(".ipynb"):
+                    yield os.path.join(directory, name)
+
+
+# SQL condition and parameters restricting notebooks.path to the given files or directories.
+def under_roots(roots):
+    clauses, params = [], []
+    for root in roots:
+        root = os.path.abspath(root)
+        prefix = root.rstrip("/") + "/"
+        clauses.append("(n.path = ? OR (n.path >= ? AND n.path < ?))")
+        params += [root, prefix, prefix[:-1] + chr(ord("/") + 1)]
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def remove_docs(db, notebook_id):
+    rows = db.execute("SELECT id, text FROM docs WHERE notebook = ?", (notebook_id,)).fetchall()
+    # Postings are keyed by trigram; the stored text says exactly which ones this notebook's docs added.
+    postings = ((tri, doc) for doc, text in rows for tri in trigrams(text))
+    db.executemany("DELETE FROM postings WHERE tri = ? AND doc = ?", postings)
+    db.execute("DELETE FROM docs WHERE notebook = ?", (notebook_id,))
+
+
+def add_docs(db, notebook_id, nb, outputs):
+    postings = []
+    for i, cell in enumerate(nb.cells):
+        docs = [(None, cell.source)]
+        if outputs and cell.cell_type == "code":
+            docs += [(j, text) for j, text in enumerate(cell.output_texts) if text]
+        for output, text in docs:
+            doc = db.execute(
+                "INSERT INTO docs (notebook, cell, output, cell_type, text) VALUES (?, ?, ?, ?, ?)",
+                (notebook_id, i, output, cell.cell_type, text),
+            ).lastrowid
+            postings += ((tri, doc) for tri in trigrams(text))
+    postings.sort()  # in key order, the inserts walk the B-tree instead of jumping around it
+    db.executemany("INSERT INTO postings VALUES (?, ?)", postings)
+
+
+# row is the notebook's NOTEBOOK_COLUMNS from the index, or None when new; True when its cells were (re)indexed.
+def index_notebook(db, path, stat, row, outputs):
+    with open(path, "rb") as f:
+        data = f.read()
+    sha1 = hashlib.sha1(data).hexdigest()
+    outputs = outputs or bool(row and row[4])  # once a notebook's outputs are indexed, keep them indexed
+    if row and row[3] == sha1 and bool(row[4]) == outputs:
+        db.execute("UPDATE notebooks SET mtime_ns = ?, size = ? WHERE id = ?", (stat.st_mtime_ns, stat.st_size, row[0]))
+        return False
+    try:
+        nb = nb_core.parse(data.decode("utf-8"))
+    except ValueError as e:
+        print(f"skipping {path}: {e}", file=sys.stderr)
+        nb = nb_core.Notebook({}, [])
+    if row:
+        remove_docs(db, row[0])
+        notebook_id = row[0]
+        db.execute(
+            "UPDATE notebooks SET mtime_ns = ?, size = ?, sha1 = ?, outputs = ? WHERE id = ?",
+            (stat.st_mtime_ns, stat.st_size, sha1, outputs, notebook_id),
+        )
+    else:
+        notebook_id = db.execute(
+            "INSERT INTO notebooks (path, mtime_ns, size, sha1, outputs) VALUES (?, ?, ?, ?, ?)",
+            (path, stat.st_mtime_ns, stat.st_size, sha1, outputs),
+        ).lastrowid
+    add_docs(db, notebook_id, nb, outputs)
+    return True
+
+
+NOTEBOOK_COLUMNS = "n.id, n.path, n.mtime_ns, n.sha1, n.outputs, n.size"
+
+
+def begin_write(db):
+    # IMMEDIATE takes the write lock before the row is re-read, so two updaters (a search's refresh during an
+    # nb_watch.py batch) queue on the busy timeout instead of both inserting the same path.
+    if not db.in_transaction:
+        db.execute("BEGIN IMMEDIATE")
+
+
+# Returns (indexed, removed). Commits about once a second, so an interrupted pass keeps most of its work.
+def update(db, roots, outputs=False, paths=None):
+    where, params = under_roots(roots)
+    known = {row[1]: row for row in db.execute(f"SELECT {NOTEBOOK_COLUMNS} FROM notebooks n WHERE {where}", params)}
+    indexed = removed = 0
+    last_commit = time.monotonic()
+    with claptrap_trace.span("index.update") as current:
+        for path in (paths if paths is not None else find_notebooks(roots)):
+            row = known.pop(path, None)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                if row:
+                    known[path] = row  # removed below
+                continue
+            if row and row[2] == stat.st_mtime_ns and row[5] == stat.st_size and (row[4] or not outputs):
+                continue
+            begin_write(db)
+            # known was read before the lock; another updater may have indexed this path since.
+            row = db.execute(f"SELECT {NOTEBOOK_COLUMNS} FROM notebooks n WHERE n.path = ?", (path,)).fetchone()
+            if row and row[2] == stat.st_mtime_ns and row[5] == stat.st_size and (row[4] or not outputs):
+                continue
+            indexed += index_notebook(db, path, stat, row, outputs)
+            if time.monotonic() - last_commit > COMMIT_INTERVAL_S:
+                db.commit()
+                last_commit = time.monotonic()
+        for path, row in known.items():
+            if paths is None or path in paths:
+                begin_write(db)
+                remove_docs(db, row[0])
+                removed += db.execute("DELETE FROM notebooks WHERE id = ?", (row[0],)).rowcount
+        db.commit()
+        current.set(indexed=indexed, removed=removed)
+    return indexed, removed
+
+
+###################################################################################################
+# Query
+###################################################################################################
+# Alternatives requiring left AND right; if that grows too large, the smaller side alone still filters.
+def both(left, right):
+    combined = frozenset(a | b for a in left for b in right)
+    if len(combined) <= MAX_ALTERNATIVES:
+        return combined
+    return min(left, right, key=len)
+
+
+def either(sides):
+    combined = frozenset().union(*sides)
+    if frozenset() in combined or len(combined) > MAX_ALTERNATIVES:
+        return ANYTHING
+    return combined
+
+
+# Alternatives (sets of literals, all of which must occur) that any match of the parsed sequence satisfies.
+def required(items, icase):
+    result, run = ANYTHING, []
+
+    def flush():
+        nonlocal result
+        if len(run) >= 3:
+            result = both(result, frozenset([frozenset(["".join(run)])]))
+        run.clear()
+
+    for op, av in items:
+        if op == sre_parse.LITERAL and not (icase and av > 127):
+            run.append(chr(av))
+        elif op == sre_parse.AT:
+            continue  # zero-width: the literals on either side are still adjacent
+        else:
+            flush()
+            if op == sre_parse.SUBPATTERN:
+                _, add_flags, del_flags, sub = av
+                sub_icase = (icase or bool(add_flags & re.IGNORECASE)) and not del_flags & re.IGNORECASE
+                result = both(result, required(sub, sub_icase))
+            elif op in REPEATS and av[0] >= 1:
+                result = both(result, required(av[2], icase))
+            elif op == getattr(sre_parse, "ATOMIC_GROUP", None):
+                result = both(result, required(av, icase))
+            elif op == sre_parse.BRANCH:
+                result = both(result, either([required(branch, icase) for branch in av[1]]))
+    flush()
+    return result
+
+
+# One trigram set per alternative, or None when some alternative has no usable literal.
+def query_trigrams(pattern, flags):
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, RecursionError):
+        return None
+    alternatives = required(parsed, bool(parsed.state.flags & re.IGNORECASE))
+    sets = [set().union(*(trigrams(literal) for literal in alternative)) for alternative in alternatives]
+    if not sets or not all(sets):
+        return None
+    return [sorted(tris)[:MAX_TRIGRAMS] for tris in sets]
+
+
+def candidates(db, roots, tri_sets, outputs):
+    where, params = under_roots(roots)
+    if not outputs:
+        where += " AND d.output IS NULL"
+    if tri_sets is not None:
+        subqueries = [
+            f"SELECT doc FROM postings WHERE tri IN ({','.join('?' * len(tris))}) GROUP BY doc HAVING COUNT(*) = {len(tris)}"
+            for tris in tri_sets
+        ]
+        where += f" AND d.id IN ({' UNION '.join(subqueries)})"
+        params = params + [tri for tris in tri_sets for tri in tris]
+    return db.execute(
+        "SELECT n.path, d.cell, d.output, d.cell_type, d.text FROM docs d JOIN notebooks n ON n.id = d.notebook "
+        f"WHERE {where} "
+        "ORDER BY n.path, d.cell, d.output IS NOT NULL, d.output",
+        params,
+    )
+
+
+def search(db, pattern, roots, outputs=False, ignore_case=False):
+    flags = re.IGNORECASE if ignore_case else 0
+    try:
+        regex = re.compile(pattern, flags)
+    except re.error as e:
+        print(f"Invalid regex: {e}", file=sys.stderr)
+        sys.exit(1)
+    tri_sets = query_trigrams(pattern, flags)
+    found, notebooks, checked, current_path = 0, 0, 0, None
+    with claptrap_trace.span("index.query", filtered=tri_sets is not None) as current:
+        for path, cell, output, cell_type, text in candidates(db, roots, tri_sets, outputs):
+            checked += 1
+            matches = nb_core.matching_lines(regex, text)
+            if not matches:
+                continue
+            if path != current_path:
+                if current_path is not None:
+                    print()
+                print(f"== {path}")
+                current_path, notebooks = path, notebooks + 1
+            found += len(matches)
+            print(f"Cell {cell} [{cell_type}]:" if output is None else f"Cell {cell} [{cell_type}] output {output}:")
+            for ln, line in matches:
+                print(f"  {ln}: {line}")
+        current.set(candidates=checked)
+    if found == 0:
+        print("No matches found.")
+    else:
+        print(f"\n{found} match{'es' if found != 1 else ''} found in {notebooks} notebook{'s' if notebooks != 1 else ''}.")
+
+
+def stats(db):
+    notebooks, with_outputs = db.execute("SELECT COUNT(*), COALESCE(SUM(outputs), 0) FROM notebooks").fetchone()
+    docs = db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+    postings = db.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+    path = db.execute("PRAGMA database_list").fetchone()[2]
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    print(f"Index: {path}  ({size / 1e6:.1f} MB)")
+    print(f"Notebooks: {notebooks} ({with_outputs} with outputs)  |  Docs: {docs}  |  Postings: {postings}")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Trigram index for regex search across many notebooks")
+    p.add_argument("--index", help=f"index file (default ${INDEX_ENV} or {DEFAULT_INDEX})")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    up = sub.add_parser("update", help="Index new and changed notebooks under the roots")
+    up.add_argument("roots", nargs="*", default=["."], help="Directories or notebooks (default: .)")
+    up.add_argument("--outputs", action="store_true", help="Also index output text")
+
+    sp = sub.add_parser("search", help="Search the indexed notebooks under the roots")
+    sp.add_argument("pattern", help="Regex pattern to search for")
+    sp.add_argument("roots", nargs="*", default=["."], help="Directories or notebooks (default: .)")
+    sp.add_argument("--outputs", action="store_true", help="Also search cell outputs")
+    sp.add_argument("-i", "--ignore-case", action="store_true")
+    sp.add_argument("--no-update", action="store_true", help="Search the index as it is, without refreshing the roots")
+
+    sub.add_parser("stats", help="Show index size")
+    args = p.parse_args(argv)
+
+    db = connect(args.index)
+    if args.command == "update":
+        indexed, removed = update(db, args.roots, args.outputs)
+        print(f"Indexed {indexed} notebook(s), removed {removed}")
+    elif args.command == "search":
+        if not args.no_update:
+            update(db, args.roots, args.outputs)
+        search(db, args.pattern, args.roots, args.outputs, args.ignore_case)
+    else:
+        stats(db)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,11 @@
 #!/usr/bin/env python3
 """Read notebook cell source and/or outputs with smart MIME selection and truncation."""
 import argparse
-import json
-import re
 import sys
 
-ANSI_RE = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]")
-
-
-def join_source(src):
-    return "".join(src) if isinstance(src, list) else src
+import claptrap_trace
+import nb_core
+from nb_core import ANSI_RE, TEXT_MIMES, join_source
 
 
 def format_output(output, max_lines):
@@ -27,7 +23,7 @@ def format_output(output, max_lines):
         lines.extend(f"  {l}" for l in clean.splitlines())
     elif otype in ("execute_result", "display_data"):
         data = output.get("data", {})
-        for mime in ("text/plain", "text/markdown", "text/html"):
+        for mime in TEXT_MIMES:
             if mime in data:
                 text = join_source(data[mime])
                 label = mime.split("/")[1]
@@ -50,10 +46,7 @@ def format_output(output, max_lines):
 
 
 def read_notebook(path, cell_idx=None, show_outputs=False, max_lines=50, cell_type=None):
-    with open(path) as f:
-        nb = json.load(f)
-
-    cells = nb.get("cells", [])
+    cells = nb_core.load(path).cells
     if cell_idx is not None:
         if cell_idx < 0 or cell_idx >= len(cells):
             print(f"Error: cell {cell_idx} out of range (0-{len(cells)-1})", file=sys.stderr)
@@ -62,35 +55,42 @@ def read_notebook(path, cell_idx=None, show_outputs=False, max_lines=50, cell_ty
     else:
         targets = list(enumerate(cells))
 
+    with claptrap_trace.span("render", cells=len(targets)):
+        render_cells(targets, show_outputs, max_lines, cell_type)
+
+
+def render_cells(targets, show_outputs, max_lines, cell_type):
     for i, cell in targets:
-        ct = cell.get("cell_type", "?")
+        ct = cell.cell_type
         if cell_type and ct != cell_type:
             continue
 
-        src = join_source(cell.get("source", ""))
-        ec = cell.get("execution_count")
+        ec = cell.execution_count
         header = f"# Cell {i} [{ct}]"
         if ct == "code" and ec is not None:
             header += f" exec={ec}"
         print(header)
-        print(src)
+        print(cell.source)
 
         if show_outputs and ct == "code":
-            outputs = cell.get("outputs", [])
-            if outputs:
+            if cell.output_count:
                 print("# --- outputs ---")
-                for out in outputs:
+                for out in cell.outputs:
                     for line in format_output(out, max_lines):
                         print(line)
         print()
 
 
-if __name__ == "__main__":
+def main(argv=None):
     p = argparse.ArgumentParser(description="Read notebook cell source/outputs")
     p.add_argument("notebook")
     p.add_argument("--cell", type=int, default=None, help="Read a specific cell index")
     p.add_argument("--outputs", action="store_true", help="Include cell outputs")
     p.add_argument("--max-output-lines", type=int, default=50, help="Max output lines per cell (0=unlimited)")
     p.add_argument("--type", choices=["code", "markdown", "raw"], help="Filter by cell type")
-    args = p.parse_args()
+    args = p.parse_args(argv)
     read_notebook(args.notebook, args.cell, args.outputs, args.max_output_lines or 0, args.type)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 """Quick overview of a Jupyter notebook: cell types, line counts, first lines, execution order."""
-import json
 import sys
 
+import claptrap_trace
+import nb_core
+
 
 def summarize(path):
-    with open(path) as f:
-        nb = json.load(f)
+    nb = nb_core.load(path)
 
-    cells = nb.get("cells", [])
+    cells = nb.cells
     if not cells:
         print("Empty notebook (no cells)")
         return
@@ -17,19 +18,22 @@ def summarize(path):
     print(f"Kernel: {kernel}  |  Cells: {len(cells)}  |  Format: v{nb.get('nbformat', '?')}")
     print()
 
+    with claptrap_trace.span("render", cells=len(cells)):
+        render_cells(cells)
+
+
+def render_cells(cells):
     exec_counts = []
     for i, cell in enumerate(cells):
-        ct = cell.get("cell_type", "?")
-        src_lines = cell.get("source", [])
-        if isinstance(src_lines, str):
-            src_lines = src_lines.splitlines(True)
+        ct = cell.cell_type
+        src_lines = cell.lines
         n_lines = len(src_lines)
-        first = (src_lines[0].rstrip("\n") if src_lines else "").strip()
+        first = (src_lines[0] if src_lines else "").strip()
         if len(first) > 80:
             first = first[:77] + "..."
 
-        ec = cell.get("execution_count")
-        n_outputs = len(cell.get("outputs", []))
+        ec = cell.execution_count
+        n_outputs = cell.output_count
 
         if ct == "code":
             ec_str = f"[{ec}]" if ec is not None else "[_]"
@@ -41,8 +45,13 @@ def summarize(path):
             print(f"  {i:>3}  {ct:<8}        {n_lines:>3}L  {first}")
 
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
         print("Usage: nb_summary.py <notebook.ipynb>")
         sys.exit(1)
-    summarize(sys.argv[1])
+    summarize(argv[0])
+
+
+if __name__ == "__main__":
+    main()
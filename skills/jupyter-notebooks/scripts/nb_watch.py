@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Keep the nb_index.py index fresh in the background by re-indexing notebooks as they are saved."""
+
+# inotify (through ctypes) on Linux, else nb_index.py's stat walk; saves are debounced so an autosave burst costs one parse.
+
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import fcntl
+import os
+import select
+import struct
+import sys
+import time
+
+import claptrap_trace
+import nb_index
+
+ROOTS_ENV = "CLAPTRAP_NB_ROOTS"
+NICENESS = 10
+DEBOUNCE_S = 1.0
+MAX_DELAY_S = 10.0  # a root that never goes quiet still gets re-indexed this often
+POLL_INTERVAL_S = 5.0
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x1000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; a NUL-padded name of len bytes follows
+
+
+def log(message):
+    print(f"{time.strftime('%H:%M:%S')} {message}", file=sys.stderr, flush=True)
+
+
+# Recursive directory watches over one inotify descriptor.
+class Inotify:
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+
+    def watch_tree(self, root):
+        for directory, dirs, _ in os.walk(root):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                code = ctypes.get_errno()
+                if code in (errno.ENOENT, errno.ENOTDIR):
+                    continue  # gone between listing and watching
+                raise OSError(code, f"inotify_add_watch {directory}: {os.strerror(code)}")
+            self.dirs[wd] = directory
+
+    # (path, mask) for each event, waiting up to timeout seconds (None: until one arrives).
+    def read(self, timeout):
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        data = os.read(self.fd, 64 * 1024)
+        events, offset = [], 0
+        while offset < len(data):
+            wd, mask, _, size = EVENT.unpack_from(data, offset)
+            name = data[offset + EVENT.size:offset + EVENT.size + size].rstrip(b"\0")
+            offset += EVENT.size + size
+            directory = self.dirs.get(wd)
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+            if directory is not None or mask & IN_Q_OVERFLOW:
+                events.append((os.path.join(directory, os.fsdecode(name)) if directory and name else directory, mask))
+        return events
+
+
+def lock_index(index):
+    path = (index or os.environ.get(nb_index.INDEX_ENV) or nb_index.DEFAULT_INDEX) + ".watch.lock"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    handle = open(path, "w")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print(f"Another nb_watch.py already keeps this index fresh (lock: {path})", file=sys.stderr)
+        sys.exit(1)
+    return handle
+
+
+def reindex(db, roots, outputs, paths=None):
+    with claptrap_trace.span("watch.batch", paths=len(paths) if paths is not None else -1):
+        indexed, removed = nb_index.update(db, roots, outputs, paths)
+    claptrap_trace.flush()  # the watcher runs until killed; don't hold its spans for an exit that may never run
+    if indexed or removed:
+        log(f"re-indexed {indexed} notebook(s), removed {removed}")
+
+
+def poll(db, roots, outputs, interval):
+    log(f"polling {', '.join(roots)} every {interval:g}s")
+    while True:
+        time.sleep(interval)
+        reindex(db, roots, outputs)
+
+
+def watch(db, roots, outputs, debounce, inotify):
+    for root in roots:
+        inotify.watch_tree(root)
+    log(f"watching {len(inotify.dirs)} directories under {', '.join(roots)}")
+    pending, full, quiet_at, first_at = set(), False, None, None
+    while True:
+        timeout = None if quiet_at is None else max(0.0, quiet_at - time.monotonic())
+        for path, mask in inotify.read(timeout):
+            if mask & IN_Q_OVERFLOW:
+                full = True  # events were dropped; only a walk knows what changed
+            elif mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not os.path.basename(path).startswith("."):
+                    inotify.watch_tree(path)
+                    pending.update(nb_index.find_notebooks([path]))
+                elif mask & (IN_MOVED_FROM | IN_DELETE):
+                    full = True  # every notebook under it is gone from this path
+            elif path and path.endswith(".ipynb") and mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE):
+                pending.add(path)
+            else:
+                continue
+            first_at = first_at or time.monotonic()
+            quiet_at = min(time.monotonic() + debounce, first_at + MAX_DELAY_S)
+        if quiet_at is not None and time.monotonic() >= quiet_at:
+            reindex(db, roots, outputs, None if full else pending)
+            pending, full, quiet_at, first_at = set(), False, None, None
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Re-index notebooks in the background as they change")
+    p.add_argument("roots", nargs="*", help=f"Directories to watch (default: ${ROOTS_ENV}, else .)")
+    p.add_argument("--index", help=f"index file (default ${nb_index.INDEX_ENV} or {nb_index.DEFAULT_INDEX})")
+    p.add_argument("--outputs", action="store_true", help="Also index output text")
+    p.add_argument(
+        "--debounce",
+        type=float,
+        default=DEBOUNCE_S,
+        help="Seconds of quiet before re-indexing changed notebooks",
+    )
+    p.add_argument(
+        "--poll",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=f"Poll instead of using inotify (default interval {POLL_INTERVAL_S:g}s when inotify is unavailable)",
+    )
+    args = p.parse_args(argv)
+
+    roots = args.roots or [r for r in os.environ.get(ROOTS_ENV, "").split(os.pathsep) if r] or ["."]
+    roots = [os.path.abspath(os.path.expanduser(root)) for root in roots]
+    lock = lock_index(args.index)  # held, unused, for the life of the process
+    try:
+        os.nice(NICENESS)
+    except OSError:
+        pass
+    db = nb_index.connect(args.index)
+    reindex(db, roots, args.outputs)  # catch up on whatever changed while no watcher ran
+
+    try:
+        if args.poll is None:
+            try:
+                inotify = Inotify()
+            except (OSError, AttributeError) as e:  # AttributeError: no inotify in this libc (macOS)
+                log(f"inotify unavailable ({e}); falling back to polling")
+            else:
+                try:
+                    watch(db, roots, args.outputs, args.debounce, inotify)
+                except OSError as e:  # typically ENOSPC: fs.inotify.max_user_watches exhausted
+                    log(f"inotify failed ({e}); falling back to polling")
+        poll(db, roots, args.outputs, args.poll or POLL_INTERVAL_S)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()